@@ -1,6 +1,11 @@
-from hill_racing_env.envs.hill_racing import HillRacingEnv
-from hill_racing_env.envs.agent import Agent
-from hill_racing_env.envs.car import Car
-from hill_racing_env.envs.ground import Ground
-from hill_racing_env.envs.person import Person
-from hill_racing_env.envs.wheels import Wheel
\ No newline at end of file
+from .hill_racing import HillRacingEnv
+from .hill_racing_vector import HillRacingVectorEnv
+from .hill_racing_multi_agent import HillRacingMultiAgentEnv
+from .agent import Agent
+from .car import Car
+from .ground import Ground
+from .person import Person
+from .wheels import Wheel
+from .trajectory_recorder import TrajectoryRecorder
+from .state_recorder import StateRecorder, StateRecording, render_recording
+from .evaluate import EpisodeResult, evaluate
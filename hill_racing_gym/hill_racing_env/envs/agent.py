@@ -1,15 +1,21 @@
-import car
-import hill_racing
+from . import car
+from . import hill_racing
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from . import sprite_atlas
 
 
 class Agent:
-    def __init__(self, real_world):
+    def __init__(self, real_world, spawning_y: float = 0):
         self.dead = False  # Whether the agent is dead
         self.score = 0
         self.world = real_world
         self.car = None
         self.spawning_x = hill_racing.SPAWNING_X  # Spawn location
-        self.spawning_y = hill_racing.SPAWNING_Y
+        self.spawning_y = spawning_y  # Calculated by the ground the agent is spawned on
+        self.pan_x = 0  # Camera offset that follows the car
+        self.pan_y = 0
         self.steps_in_air = 0
         self.airtime_counter = 0
         self.total_airtime = 0
@@ -17,16 +23,20 @@ class Agent:
     def add_to_world(self):
         self.car = car.Car(x=self.spawning_x, y=self.spawning_y, world=self.world, agent=self)
 
-    def draw_agent(self, surface_screen):
+    def draw_agent(self, surface_screen, atlas: 'sprite_atlas.SpriteAtlas'):
         if not self.dead:  # Draw car when agent has died less than dead count amount
-            self.car.draw_person_car(surface_screen)
+            self.car.draw_person_car(surface_screen, atlas, self.pan_x, self.pan_y)
 
     def update(self):
         # print(self.car.chassis_body.position.x, self.car.max_distance)
         # print(self.car.wheels[0].joint.speed, self.car.wheels[1].joint.speed)
-        # Update the panX and panY offset for camera
-        hill_racing.panX = self.car.chassis_body.position.x * hill_racing.SCALE - 100
-        # hill_racing.panY = self.car.chassis_body.position.y * hill_racing.SCALE - hill_racing.SPAWNING_Y
+        # Update the pan_x and pan_y offset for camera
+        self.pan_x = self.car.chassis_body.position.x * hill_racing.SCALE - 100
+        # self.pan_y = self.car.chassis_body.position.y * hill_racing.SCALE - self.spawning_y
+
+        # A restored snapshot (see snapshot) starts without contacts, on_ground follows the contacts from the first step
+        for wheel in self.car.wheels:
+            wheel.on_ground = wheel.ground_contacts > 0
 
         if self.car.dead:  # If the car is dead
             self.dead = True
@@ -53,7 +63,7 @@ class Agent:
 
     def reset_car(self):
         self.destroy_agent()
-        self.car = car.Car(self.spawning_x, self.spawning_y, self.world)
+        self.car = car.Car(self.spawning_x, self.spawning_y, self.world, agent=self)
 
     def destroy_agent(self):
         self.world.DestroyBody(self.car.chassis_body)
@@ -0,0 +1,586 @@
+import argparse
+import datetime
+import json
+import os
+import pickle
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import gymnasium as gym
+import noise
+import numpy as np
+from Box2D import b2World
+from . import agent
+from . import ground
+from . import hill_racing
+from . import perlin
+from .hill_racing import HillRacingEnv
+from .hill_racing_vector import HillRacingVectorEnv
+
+
+# The original point-by-point terrain generation, used as reference for correctness and speed
+def legacy_randomize_ground(seed: int, original_noise: bool = False,
+                            difficulty: int = hill_racing.DIFFICULTY) -> np.ndarray:
+    random.seed(seed)
+    ground_seed = random.uniform(0, 100000)
+    distance = hill_racing.GROUND_DISTANCE
+    min_height = 30
+    flat_length = 500
+    height_addition = 0
+    heights = []
+    for i in range(0, distance, 15):
+        steepness_level = np.interp(i, [0, distance], [130, 250])
+        if original_noise is True:
+            flat_length = 0
+            noised_y = abs(perlin.original_pnoise(ground_seed + (i - flat_length) / (700 - steepness_level)))
+        else:
+            noised_y = abs(noise.pnoise1(ground_seed + (i - flat_length) / (700 - steepness_level), octaves=4))
+        max_height = difficulty + np.interp(steepness_level, [0, 200], [0, 320])
+        if i < flat_length:
+            noised_y = abs(noise.pnoise1(ground_seed, octaves=4))
+            height_addition = (flat_length - i) / 25
+        heights.append(hill_racing.SCREEN_HEIGHT - np.interp(noised_y, [0, 1], [min_height, max_height])
+                       + height_addition)
+    return np.array(heights, dtype=np.float32)
+
+
+# The original O(n^2) steepness check, used as reference for correctness and speed
+def legacy_ground_too_steep(terrain: ground.Ground) -> bool:
+    for vector in terrain.ground_vectors:
+        positions = terrain.getPositions(vector.x, 10, 1)
+        total_difference = 0
+        for i in range(1, len(positions)):
+            total_difference += max(0, positions[i - 1] - positions[i])
+        if total_difference > 5:
+            return True
+    return False
+
+
+# Compares the vectorized terrain generation against the legacy loop, both for speed and bit-equality
+def bench_terrain(seeds: int, difficulty: int):
+    legacy_time = 0.0
+    vectorized_time = 0.0
+    mismatches = 0
+    for seed in range(seeds):
+        start = time.perf_counter()
+        legacy = legacy_randomize_ground(seed, difficulty=difficulty)
+        legacy_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        terrain = ground.Ground(difficulty=difficulty)
+        terrain.randomize_ground(seed=seed)
+        vectorized_time += time.perf_counter() - start
+
+        if not np.array_equal(terrain.vertices[:-2, 1], (legacy.astype(np.float64) / hill_racing.SCALE)
+                              .astype(np.float32)):
+            mismatches += 1
+    print(f"terrain generation over {seeds} seeds:")
+    print(f"  legacy loop: {legacy_time / seeds * 1000:.3f} ms/reset")
+    print(f"  vectorized:  {vectorized_time / seeds * 1000:.3f} ms/reset "
+          f"({legacy_time / vectorized_time:.1f}x faster)")
+    print(f"  mismatching terrains: {mismatches}")
+
+
+# Compares the windowed steepness validator against the legacy check, both for speed and verdicts
+def bench_steepness(seeds: int, difficulty: int):
+    legacy_time = 0.0
+    windowed_time = 0.0
+    mismatches = 0
+    too_steep = 0
+    for seed in range(seeds):
+        terrain = ground.Ground(difficulty=difficulty)
+        terrain.randomize_ground(seed=seed)
+
+        start = time.perf_counter()
+        legacy = legacy_ground_too_steep(terrain)
+        legacy_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        verdict, _ = terrain.check_steepness()
+        windowed_time += time.perf_counter() - start
+
+        mismatches += legacy != verdict
+        too_steep += verdict
+    print(f"steepness validation over {seeds} seeds (difficulty {difficulty}, {too_steep} too steep):")
+    print(f"  legacy check: {legacy_time / seeds * 1000:.3f} ms/terrain")
+    print(f"  windowed:     {windowed_time / seeds * 1000:.3f} ms/terrain "
+          f"({legacy_time / windowed_time:.1f}x faster)")
+    print(f"  mismatching verdicts: {mismatches}")
+
+
+# Measures the reset latency when resetting to the same seed (ground is reused) and to a new seed every time,
+# both with the full ground and with the streaming ground in the world
+def bench_reset(resets: int, difficulty: int):
+    workloads = {
+        "fixed seed": [0] * resets,
+        "random seed": list(range(1, resets + 1)),
+    }
+    print(f"reset latency over {resets} resets:")
+    for streaming_ground in (False, True):
+        env = HillRacingEnv(streaming_ground=streaming_ground, difficulty=difficulty)
+        for name, seeds in workloads.items():
+            env.reset(seed=seeds[0])
+            reset_time = 0.0
+            for seed in seeds:
+                # Step once between resets like an episode would, Box2D only clears its proxy move buffer in a step
+                env.step(env.action_space.sample())
+                start = time.perf_counter()
+                env.reset(seed=seed)
+                reset_time += time.perf_counter() - start
+            print(f"  {'streaming' if streaming_ground else 'full'} ground, {name}: "
+                  f"{reset_time / resets * 1000:.3f} ms/reset")
+        env.close()
+
+
+# Compares the env-steps/sec of the native vector env with Gymnasium's SyncVectorEnv over HillRacingEnv instances
+def bench_vector(num_envs: int, steps: int, difficulty: int):
+    envs = {
+        "SyncVectorEnv": gym.vector.SyncVectorEnv([lambda: HillRacingEnv(difficulty=difficulty)
+                                                   for _ in range(num_envs)]),
+        "HillRacingVectorEnv": HillRacingVectorEnv(num_envs, difficulty=difficulty),
+    }
+    print(f"vector env throughput with {num_envs} envs over {steps} steps:")
+    for name, env in envs.items():
+        env.reset(seed=0)
+        actions = np.random.default_rng(0).integers(0, 3, size=(steps, num_envs))  # Same random actions for both
+        start = time.perf_counter()
+        for step_actions in actions:
+            env.step(step_actions)
+        print(f"  {name}: {steps * num_envs / (time.perf_counter() - start):.0f} env-steps/s")
+        env.close()
+
+
+# Physics profiles compared by the physics benchmark, as (physics_profile, physics_config)
+BENCH_PHYSICS_PROFILES = {
+    "accurate": ("accurate", None),
+    "fast": ("fast", None),
+    "fast, 2 sub-steps": ("custom", {"velocity_iterations": 8, "position_iterations": 3, "sub_steps": 2}),
+    "accurate, frame skip 4": ("custom", {"frame_skip": 4}),
+    "fast, frame skip 4": ("custom", {"velocity_iterations": 8, "position_iterations": 3, "frame_skip": 4}),
+}
+
+
+# Plays one episode with the given actions, returns the x-position after every step, the final score, whether the
+# agent died and the time spent stepping
+def run_physics_episode(env: HillRacingEnv, seed: int, actions: np.ndarray) -> tuple[np.ndarray, int, bool, float]:
+    env.reset(seed=seed)
+    positions = []
+    start = time.perf_counter()
+    for action in actions:
+        _, _, terminated, truncated, info = env.step(int(action))
+        positions.append(info["car_position"][0])
+        if terminated or truncated:
+            break
+    return np.array(positions), env.agent.score, env.agent.dead, time.perf_counter() - start
+
+
+# Compares the throughput and fidelity of the physics profiles on the same seeds and action sequences.
+# Every profile is compared against the accurate profile with the same frame skip, so both apply the same action
+# for the same frames and only the solver differs.
+def bench_physics(seeds: int, frames: int, difficulty: int):
+    print(f"physics profiles over {seeds} seeds, {frames} frames ({frames / hill_racing.FPS:.0f} s) per episode:")
+    references = {}
+    for name, (physics_profile, physics_config) in BENCH_PHYSICS_PROFILES.items():
+        env = HillRacingEnv(difficulty=difficulty, physics_profile=physics_profile, physics_config=physics_config)
+        reference_env = HillRacingEnv(difficulty=difficulty, physics_profile="custom",
+                                      physics_config={"frame_skip": env.action_repeat})
+        rng = np.random.default_rng(0)  # Same action sequences for every profile, mostly gas so the car gets far
+        frames_done = 0
+        step_time = 0.0
+        errors = []
+        final_errors = []
+        scores = []
+        deaths = 0
+        reference_scores = []
+        reference_deaths = 0
+        for seed in range(seeds):
+            actions = rng.choice(3, size=frames // env.action_repeat, p=[0.1, 0.8, 0.1])
+            positions, score, dead, duration = run_physics_episode(env, seed, actions)
+            if (env.action_repeat, seed) not in references:
+                references[env.action_repeat, seed] = run_physics_episode(reference_env, seed, actions)[:3]
+            reference_positions, reference_score, reference_dead = references[env.action_repeat, seed]
+            frames_done += env.step_counter
+            step_time += duration
+            common = min(len(positions), len(reference_positions))
+            errors.append(np.abs(positions[:common] - reference_positions[:common]))
+            final_errors.append(abs(positions[common - 1] - reference_positions[common - 1]))
+            scores.append(score)
+            deaths += dead
+            reference_scores.append(reference_score)
+            reference_deaths += reference_dead
+        env.close()
+        reference_env.close()
+        errors = np.concatenate(errors)
+        print(f"  {name}: {frames_done / step_time:.0f} frames/s")
+        print(f"    x-position error vs accurate: mean {errors.mean():.3f} m, max {errors.max():.3f} m, "
+              f"final mean {np.mean(final_errors):.3f} m")
+        print(f"    score {np.mean(scores):.1f} +- {np.std(scores):.1f} (accurate {np.mean(reference_scores):.1f} "
+              f"+- {np.std(reference_scores):.1f}), deaths {deaths}/{seeds} (accurate {reference_deaths}/{seeds})")
+
+
+# Compares repeating every action k times with separate steps against the native action_repeat option
+def bench_action_repeat(frames: int, repeat: int, difficulty: int):
+    print(f"action repeat {repeat} over {frames} frames:")
+    envs = {
+        "separate steps": (HillRacingEnv(difficulty=difficulty), repeat),
+        "action_repeat": (HillRacingEnv(difficulty=difficulty, action_repeat=repeat), 1),
+    }
+    for name, (env, calls) in envs.items():
+        rng = np.random.default_rng(0)
+        env.reset(seed=0)
+        frames_done = 0  # Frames of the finished episodes
+        start = time.perf_counter()
+        while frames_done + env.step_counter < frames:
+            action = int(rng.choice(3, p=[0.1, 0.8, 0.1]))
+            for _ in range(calls):
+                _, _, terminated, truncated, _ = env.step(action)
+                if terminated or truncated:
+                    frames_done += env.step_counter
+                    env.reset(seed=0)
+                    break
+        frames_done += env.step_counter
+        print(f"  {name}: {frames_done / (time.perf_counter() - start):.0f} frames/s")
+        env.close()
+
+
+# Compares the steps/sec of the info levels on the same actions, together with the pickled size of the infos, which is
+# what a subprocess vector env sends through its pipes
+def bench_info(steps: int, difficulty: int):
+    print(f"info levels over {steps} steps:")
+    for info_level in hill_racing.INFO_LEVELS:
+        env = HillRacingEnv(difficulty=difficulty, info_level=info_level)
+        actions = np.random.default_rng(0).choice(3, size=steps, p=[0.1, 0.8, 0.1])
+        env.reset(seed=0)
+        infos = []
+        start = time.perf_counter()
+        for action in actions:
+            _, _, terminated, truncated, info = env.step(int(action))
+            infos.append(info)
+            if terminated or truncated:
+                env.reset(seed=0)
+        duration = time.perf_counter() - start
+        info_bytes = sum(len(pickle.dumps(info)) for info in infos)
+        print(f"  {info_level}: {steps / duration:.0f} steps/s, {info_bytes / steps:.1f} pickled info bytes/step")
+        env.close()
+
+
+# Compares branching from the middle of an episode by restoring a snapshot against a reset and replaying the steps,
+# and checks that every branch from the same snapshot continues the same way
+def bench_snapshot(branches: int, steps: int, difficulty: int):
+    print(f"{branches} branches after {steps} steps:")
+    env = HillRacingEnv(difficulty=difficulty, max_steps=steps * 2)
+    rng = np.random.default_rng(0)
+    prefix = rng.choice(3, size=steps, p=[0.1, 0.8, 0.1])
+    branch_actions = rng.choice(3, size=(branches, hill_racing.FPS), p=[0.1, 0.8, 0.1])
+    env.reset(seed=0)
+    for action in prefix:
+        _, _, terminated, truncated, _ = env.step(int(action))
+        if terminated or truncated:
+            raise ValueError(f"Episode ended before step {steps}, try fewer steps")
+    state = env.get_state()
+
+    restore_time = replay_time = 0
+    mismatching_branches = 0
+    for actions in branch_actions:
+        start = time.perf_counter()
+        env.set_state(state)
+        restore_time += time.perf_counter() - start
+        positions = [env.step(int(action))[0]["chassis_position"] for action in actions]
+        # Branching the same actions again from the snapshot should give the same positions
+        env.set_state(state)
+        mismatching_branches += not np.array_equal(positions, [env.step(int(action))[0]["chassis_position"]
+                                                               for action in actions])
+
+        start = time.perf_counter()
+        env.reset(seed=0)
+        for action in prefix:
+            env.step(int(action))
+        replay_time += time.perf_counter() - start
+    print(f"  restore snapshot: {restore_time / branches * 1000:.3f} ms/branch")
+    print(f"  reset and replay: {replay_time / branches * 1000:.3f} ms/branch "
+          f"({replay_time / restore_time:.0f}x slower)")
+    print(f"  branches that did not repeat: {mismatching_branches}")
+    env.close()
+
+
+# Checks the array version of the original noise against the scalar version, both for speed and bit-equality, on the
+# noise inputs of whole terrains and on random inputs (also negative ones) with a seeded table per seed
+def bench_original_noise(seeds: int, difficulty: int):
+    scalar_time = 0.0
+    array_time = 0.0
+    points = 0
+    mismatches = 0
+    for seed in range(seeds):
+        rng = random.Random(seed)
+        table = perlin.perlin_table(rng)
+        distance = hill_racing.GROUND_DISTANCE
+        xs = np.arange(0, distance, 15)
+        terrain_x = rng.uniform(0, 100000) + xs / (700 - np.interp(xs, [0, distance], [130, 250]))
+        random_x = np.random.default_rng(seed).uniform(-1000, 1000, size=len(xs))
+        for x in (terrain_x, random_x):
+            start = time.perf_counter()
+            scalar = np.array([perlin.original_pnoise(value, table=table) for value in x.tolist()])
+            scalar_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            array = perlin.original_pnoise1_array(x, table)
+            array_time += time.perf_counter() - start
+
+            points += len(x)
+            mismatches += int(np.count_nonzero(scalar != array))
+    # The same seed has to give the same original noise terrain, independent of the global random state
+    terrains = []
+    for _ in range(2):
+        random.random()
+        terrain = ground.Ground(original_noise=True, difficulty=difficulty)
+        terrain.randomize_ground(seed=seeds)
+        terrains.append(terrain.vertices)
+    print(f"original noise over {seeds} seeds, {points} points:")
+    print(f"  scalar: {scalar_time / points * 1e6:.3f} us/point")
+    print(f"  array:  {array_time / points * 1e6:.3f} us/point ({scalar_time / array_time:.1f}x faster)")
+    print(f"  mismatching points: {mismatches}")
+    print(f"  reproducible terrain from seed: {np.array_equal(terrains[0], terrains[1])}")
+
+
+# Budget for importing the environment in a fresh headless process, most of it is importing gymnasium and numpy
+IMPORT_BUDGET_MS = 500
+
+
+# Measures the time of importing the environment package in fresh processes outside the package directory, checks
+# that the median stays within the budget and that pygame is not imported when nothing is rendered
+def bench_import(runs: int, budget_ms: float = IMPORT_BUDGET_MS) -> bool:
+    package_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ, PYTHONPATH=package_dir)  # Works without installing the package
+    results = {}
+    for module in ("gymnasium", "hill_racing_env.envs"):
+        code = (f"import sys, time; start = time.perf_counter(); import {module}; "
+                f"print(time.perf_counter() - start, 'pygame' in sys.modules)")
+        times = []
+        pygame_imported = False
+        for _ in range(runs):
+            output = subprocess.run([sys.executable, "-c", code], env=env, cwd=tempfile.gettempdir(),
+                                    capture_output=True, text=True, check=True).stdout.split()
+            times.append(float(output[0]) * 1000)
+            pygame_imported |= output[1] == "True"
+        results[module] = (np.median(times), pygame_imported)
+    median, pygame_imported = results["hill_racing_env.envs"]
+    within_budget = median <= budget_ms and not pygame_imported
+    print(f"headless import time over {runs} fresh processes:")
+    print(f"  gymnasium alone: {results['gymnasium'][0]:.0f} ms median")
+    print(f"  hill_racing_env.envs: {median:.0f} ms median (budget {budget_ms:.0f} ms), "
+          f"pygame imported: {pygame_imported}")
+    print(f"  {'within' if within_budget else 'OVER'} budget")
+    return within_budget
+
+
+# Reward functions of the suite, the action reward only supports the discrete actions
+SUITE_REWARD_FUNCTIONS = {
+    "discrete_3": ["distance", "action", "wheel_speed", "airtime_wheel_speed", "airtime_distance"],
+    "continuous": ["distance", "wheel_speed", "airtime_wheel_speed", "airtime_distance"],
+}
+
+
+# Random actions that mostly give gas, so the episodes get going like the ones of a trained agent
+def suite_actions(action_space: str, steps: int, rng: np.random.Generator) -> list:
+    if action_space == "continuous":
+        return [np.array([speed], dtype=np.float32) for speed in rng.uniform(-13, 5, size=steps)]
+    return rng.choice(3, size=steps, p=[0.1, 0.8, 0.1]).tolist()
+
+
+# Measures the steps/s of step for every action space and reward function, resets between episodes are not timed
+def measure_step(steps: int, difficulty: int) -> dict:
+    results = {}
+    for action_space, reward_functions in SUITE_REWARD_FUNCTIONS.items():
+        results[action_space] = {}
+        for reward_function in reward_functions:
+            env = HillRacingEnv(action_space=action_space, reward_function=reward_function, difficulty=difficulty)
+            actions = suite_actions(action_space, steps, np.random.default_rng(0))
+            env.reset(seed=0)
+            step_time = 0.0
+            for action in actions:
+                start = time.perf_counter()
+                _, _, terminated, truncated, _ = env.step(action)
+                step_time += time.perf_counter() - start
+                if terminated or truncated:
+                    env.reset(seed=0)
+            results[action_space][reward_function] = steps / step_time
+            env.close()
+    return results
+
+
+# Measures the parts of a reset to a new seed: generating the terrain, validating its steepness and creating the ground
+# and agent bodies in a new world, next to the latency of the whole reset. Times are the means in milliseconds
+def measure_reset(resets: int, difficulty: int) -> dict:
+    parts = {"terrain_generation": 0.0, "steepness_validation": 0.0, "body_creation": 0.0}
+    for seed in range(resets):
+        start = time.perf_counter()
+        terrain = ground.Ground(difficulty=difficulty)
+        terrain.randomize_ground(seed=seed)
+        generated = time.perf_counter()
+        terrain.check_steepness()
+        validated = time.perf_counter()
+        world = b2World(gravity=(0, hill_racing.GRAVITY), doSleep=True)
+        world_ground = ground.Ground(world)
+        world_ground.cloneFrom(terrain)
+        world_ground.setBodies(world)
+        agent.Agent(real_world=world, spawning_y=world_ground.spawning_y).add_to_world()
+        parts["terrain_generation"] += generated - start
+        parts["steepness_validation"] += validated - generated
+        parts["body_creation"] += time.perf_counter() - validated
+    results = {part: part_time / resets * 1000 for part, part_time in parts.items()}
+
+    env = HillRacingEnv(difficulty=difficulty)
+    env.reset(seed=0)
+    reset_time = 0.0
+    for seed in range(1, resets + 1):
+        env.step(env.action_space.sample())
+        start = time.perf_counter()
+        env.reset(seed=seed)
+        reset_time += time.perf_counter() - start
+    env.close()
+    results["total"] = reset_time / resets * 1000
+    return results
+
+
+# Measures the frames/s of render for every render mode. Without a display the human mode draws to SDL's dummy video
+# driver, the human mode is limited to render_fps frames/s by its clock
+def measure_render(frames: int, difficulty: int) -> dict:
+    if "DISPLAY" not in os.environ and "WAYLAND_DISPLAY" not in os.environ:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    results = {}
+    for render_mode in HillRacingEnv.metadata["render_modes"]:
+        env = HillRacingEnv(render_mode=render_mode, difficulty=difficulty)
+        actions = suite_actions("discrete_3", frames, np.random.default_rng(0))
+        env.reset(seed=0)
+        env.render()  # The first frame loads the sprites and opens the screen
+        render_time = 0.0
+        for action in actions:
+            _, _, terminated, truncated, _ = env.step(action)
+            start = time.perf_counter()
+            env.render()
+            render_time += time.perf_counter() - start
+            if terminated or truncated:
+                env.reset(seed=0)
+        results[render_mode] = frames / render_time
+        env.close()
+    return results
+
+
+# Resident memory of this process in bytes, the peak resident memory where /proc is not available
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024  # Bytes on macOS, kilobytes on Linux
+
+
+# Measures the growth of the resident memory over long episodes, with and without recording the body states. The car
+# is only reset when it dies, getting stuck does not end an episode. The first episode is a warm-up
+def measure_memory(steps: int, difficulty: int) -> dict:
+    results = {}
+    for record_states in (False, True):
+        env = HillRacingEnv(difficulty=difficulty, max_steps=steps, record_states=record_states)
+        actions = suite_actions("discrete_3", steps, np.random.default_rng(0))
+        env.reset(seed=0)
+        for action in actions[:hill_racing.FPS * 10]:
+            env.step(action)
+        env.reset(seed=0)
+        start_rss = rss_bytes()
+        longest_episode = 0
+        for action in actions:
+            _, _, terminated, truncated, _ = env.step(action)
+            longest_episode = max(longest_episode, env.step_counter)
+            if terminated or truncated:
+                env.reset(seed=0)
+        growth = rss_bytes() - start_rss
+        results["record_states" if record_states else "default"] = {
+            "steps": steps,
+            "longest_episode": longest_episode,
+            "rss_start_bytes": start_rss,
+            "rss_growth_bytes": growth,
+            "rss_growth_bytes_per_1000_steps": growth / steps * 1000,
+        }
+        env.close()
+    return results
+
+
+# Commit of the package, None when it is not run from a git checkout
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Runs the step, reset, render and memory benchmarks and returns the results with the machine and commit they were
+# measured on, as JSON-serializable dict to track regressions across commits
+def run_suite(steps: int, resets: int, frames: int, memory_steps: int, difficulty: int) -> dict:
+    return {
+        "commit": git_commit(),
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "gymnasium": gym.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "settings": {"steps": steps, "resets": resets, "frames": frames, "memory_steps": memory_steps,
+                     "difficulty": difficulty},
+        "step_steps_per_second": measure_step(steps, difficulty),
+        "reset_ms": measure_reset(resets, difficulty),
+        "render_frames_per_second": measure_render(frames, difficulty),
+        "memory": measure_memory(memory_steps, difficulty),
+    }
+
+
+# Run as a module, e.g. python -m hill_racing_env.envs.benchmark vector
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks for the hill racing environment")
+    parser.add_argument("benchmark", choices=["terrain", "steepness", "reset", "vector", "physics", "repeat", "info",
+                                              "import", "noise", "snapshot", "suite"])
+    parser.add_argument("--seeds", type=int, default=100,
+                        help="Number of terrain seeds (resets, import runs or branches)")
+    parser.add_argument("--num-envs", type=int, default=8, help="Number of envs in the vector env")
+    parser.add_argument("--steps", type=int, default=2000, help="Number of (vector) env steps, or frames per episode")
+    parser.add_argument("--repeat", type=int, default=4, help="Number of frames every action is repeated")
+    parser.add_argument("--difficulty", type=int, default=hill_racing.DIFFICULTY, help="Difficulty of the terrain")
+    parser.add_argument("--frames", type=int, default=300, help="Number of rendered frames per render mode (suite)")
+    parser.add_argument("--memory-steps", type=int, default=20000, help="Number of steps of the memory suite")
+    parser.add_argument("--output", default=None, help="JSON file the suite results are written to (default stdout)")
+    args = parser.parse_args()
+
+    match args.benchmark:
+        case "terrain":
+            bench_terrain(args.seeds, args.difficulty)
+        case "steepness":
+            bench_steepness(args.seeds, args.difficulty)
+        case "reset":
+            bench_reset(args.seeds, args.difficulty)
+        case "vector":
+            bench_vector(args.num_envs, args.steps, args.difficulty)
+        case "physics":
+            bench_physics(args.seeds, args.steps, args.difficulty)
+        case "repeat":
+            bench_action_repeat(args.steps, args.repeat, args.difficulty)
+        case "info":
+            bench_info(args.steps, args.difficulty)
+        case "suite":
+            suite = run_suite(args.steps, args.seeds, args.frames, args.memory_steps, args.difficulty)
+            if args.output is None:
+                print(json.dumps(suite, indent=2))
+            else:
+                with open(args.output, "w") as file:
+                    json.dump(suite, file, indent=2)
+                print(f"Wrote the suite results to {args.output}")
+        case "snapshot":
+            bench_snapshot(args.seeds, args.steps, args.difficulty)
+        case "noise":
+            bench_original_noise(args.seeds, args.difficulty)
+        case "import":
+            sys.exit(0 if bench_import(args.seeds) else 1)
@@ -1,9 +1,12 @@
 import math
-import pygame
-import hill_racing
-import person
-import wheels
+from . import hill_racing
+from . import person
+from . import wheels
 from Box2D import *
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from . import sprite_atlas
 
 
 class Car:
@@ -12,7 +15,7 @@ class Car:
         self.id = "car"
         self.agent = agent
         self.wheels = []
-        self.starting_position = pygame.Vector2(x, y)
+        self.starting_position = hill_racing.Position(x, y)
         self.chassis_body = None
         self.chassis_width = 125
         self.chassis_height = 40
@@ -43,7 +46,9 @@ class Car:
             vector.y /= hill_racing.SCALE
         self.shapes.append(vectors)
 
-        # Create hill_racing body and fixture for car
+        # Create hill_racing body and fixture for car. Setting the vertices also sets the vertex count of the convex
+        # hull, which has one vertex less because of the duplicate last vertex. Overwriting the count would make
+        # Box2D read an uninitialized normal in collisions, which makes the simulation non-deterministic.
         car_body = b2BodyDef(
             type=b2_dynamicBody,
             position=(x / hill_racing.SCALE, y / hill_racing.SCALE),
@@ -52,10 +57,11 @@ class Car:
         car_fixture = b2FixtureDef(
             categoryBits=hill_racing.CHASSIS_CATEGORY,
             maskBits=hill_racing.CHASSIS_MASK,
+            groupIndex=hill_racing.CAR_GROUP,
             density=self.car_density,
             friction=0.5,
             restitution=self.car_restitution,
-            shape=b2PolygonShape(vertices=vectors, vertexCount=len(vectors))
+            shape=b2PolygonShape(vertices=vectors)
         )
 
         # Create body in world and connect fixture to it
@@ -74,10 +80,11 @@ class Car:
         car_fixture2 = b2FixtureDef(
             categoryBits=hill_racing.CHASSIS_CATEGORY,
             maskBits=hill_racing.CHASSIS_MASK,
+            groupIndex=hill_racing.CAR_GROUP,
             density=self.car_density,
             friction=0.5,
             restitution=self.car_restitution,
-            shape=b2PolygonShape(vertices=vectors2, vertexCount=len(vectors2))
+            shape=b2PolygonShape(vertices=vectors2)
         )
         self.chassis_body.CreateFixture(car_fixture2)
         self.shapes.append(vectors2)
@@ -95,10 +102,11 @@ class Car:
         car_fixture3 = b2FixtureDef(
             categoryBits=hill_racing.CHASSIS_CATEGORY,
             maskBits=hill_racing.CHASSIS_MASK,
+            groupIndex=hill_racing.CAR_GROUP,
             density=self.car_density,
             friction=0.1,
             restitution=0.1,
-            shape=b2PolygonShape(vertices=vectors3, vertexCount=len(vectors3))
+            shape=b2PolygonShape(vertices=vectors3)
         )
         self.chassis_body.CreateFixture(car_fixture3)
         self.shapes.append(vectors3)
@@ -141,26 +149,22 @@ class Car:
         self.chassis_body.userData = self
 
     # Function that draws/renders the person, wheels and the car on the screen
-    def draw_person_car(self, surface_screen):
+    def draw_person_car(self, surface_screen, atlas: 'sprite_atlas.SpriteAtlas', pan_x: float = 0, pan_y: float = 0):
         # Get position and angle of the car chassis in pygame numbers
         pos_x = self.chassis_body.position.x * hill_racing.SCALE
         pos_y = self.chassis_body.position.y * hill_racing.SCALE
         angle_degree = math.degrees(-self.chassis_body.angle) % 360  # Pygame uses absolute degree, Box2D uses radians
         # Draw person on screen
-        self.person.draw_person(surface_screen)
+        self.person.draw_person(surface_screen, atlas, pan_x, pan_y)
         # Draw wheels on screen
         for wheel in self.wheels:
-            wheel.draw_wheel(surface_screen)
-        # Scale the car sprite
-        hill_racing.car_sprite = pygame.transform.scale(
-            hill_racing.car_sprite, (self.chassis_width + 23, self.chassis_height * 2 + 10)
-        )
-        # Rotate the car and draw the car to screen
-        rotated_image = pygame.transform.rotate(hill_racing.car_sprite, angle_degree)
+            wheel.draw_wheel(surface_screen, atlas, pan_x, pan_y)
+        # Get the scaled and rotated car sprite and draw the car to screen
+        rotated_image = atlas.rotated("car", (self.chassis_width + 23, self.chassis_height * 2 + 10), angle_degree)
         surface_screen.blit(
             source=rotated_image,
-            dest=((-self.chassis_width / 2 - 7) + pos_x - hill_racing.panX,
-                  -self.chassis_height - 20 + pos_y - hill_racing.panY)
+            dest=((-self.chassis_width / 2 - 7) + pos_x - pan_x,
+                  -self.chassis_height - 20 + pos_y - pan_y)
         )
 
     # A function that updates whether the agent status is alive or death
@@ -211,6 +215,7 @@ class Car:
         self.wheels[1].joint.motorEnabled = False
 
     def set_motor_wheel_speed(self, motor_wheel_speed):
+        motor_wheel_speed = float(motor_wheel_speed)  # Box2D only accepts Python floats, not NumPy scalars
         self.wheels[0].joint.motorEnabled = True
         self.wheels[1].joint.motorEnabled = True
         old_state = self.motor_state
@@ -0,0 +1,169 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+from gymnasium.error import DependencyNotInstalled
+from . import hill_racing
+
+# PPO checkpoints that were trained on this env, see model_env_kwargs for the env they were trained on
+BASELINE_MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_models")
+
+
+# Stats of one evaluated episode. The end reason is "dead", "stuck" or "max_score"
+class EpisodeResult(NamedTuple):
+    seed: int
+    score: int
+    steps: int
+    end_reason: str
+    total_airtime: int
+    episode_return: float
+
+
+# Returns the env settings a baseline model was trained with, encoded in its name. "ppo_cont" models use the continuous
+# action space, "ppo_base" models the discrete one, followed by the reward function and reward type when they are not
+# the default ones, e.g. ppo_base_wheel_speed_soft_1000_0.zip
+def model_env_kwargs(path: str) -> dict:
+    name = os.path.splitext(os.path.basename(path))[0]
+    if "_action_" in name:
+        reward_function = "action"
+    elif "_wheel_speed_" in name:
+        reward_function = "wheel_speed"
+    else:
+        reward_function = "distance"
+    return {
+        "action_space": "continuous" if name.startswith("ppo_cont") else "discrete_3",
+        "reward_function": reward_function,
+        "reward_type": "soft" if "_soft_" in name else "aggressive",
+    }
+
+
+# stable-baselines3 is only needed to evaluate the PPO checkpoints
+def import_ppo():
+    try:
+        from stable_baselines3 import PPO
+    except ImportError:
+        raise DependencyNotInstalled("stable-baselines3 is not installed, try 'pip install stable-baselines3'")
+    return PPO
+
+
+# Returns a function that picks the action of an observation. The policy is the path of a stable-baselines3 PPO
+# checkpoint (predicting deterministic actions) or "random" for random actions of the env
+def load_policy(policy: str, env: 'hill_racing.HillRacingEnv') -> Callable:
+    if policy == "random":
+        return lambda observation: env.action_space.sample()
+    # The schedules are only used for training, they were pickled with the Python that trained the model and can not be
+    # loaded by every Python version, so they are replaced
+    model = import_ppo().load(policy, device="cpu", custom_objects={"learning_rate": 0.0, "lr_schedule": lambda _: 0.0,
+                                                                   "clip_range": lambda _: 0.0})
+    discrete = env.action_space_type == "discrete_3"
+
+    def predict(observation):
+        action, _ = model.predict(observation, deterministic=True)
+        return int(action) if discrete else action
+
+    return predict
+
+
+# One env and policy that evaluate episodes, the env is reused for all episodes
+class Evaluator:
+    def __init__(self, policy: str, env_kwargs: Optional[dict] = None):
+        # Only the stats of an episode are needed, so the info is only filled on the last step
+        self.env = hill_racing.HillRacingEnv(**dict(env_kwargs or {}, info_level="summary"))
+        self.policy = load_policy(policy, self.env)
+
+    # Plays the episode of a seed, random actions are seeded by the seed as well
+    def run_episode(self, seed: int) -> EpisodeResult:
+        self.env.action_space.seed(seed)
+        observation, _ = self.env.reset(seed=seed)
+        episode_return = 0
+        terminated = truncated = False
+        while not terminated and not truncated:
+            observation, reward, terminated, truncated, info = self.env.step(self.policy(observation))
+            episode_return += reward
+        return EpisodeResult(seed, info["score"], info["steps"], info["end_reason"], info["total_airtime"],
+                             float(episode_return))
+
+    def run_episodes(self, seeds: Iterable[int]) -> list[EpisodeResult]:
+        return [self.run_episode(seed) for seed in seeds]
+
+
+# Evaluator of a worker process, made once by the initializer of the pool
+worker_evaluator: Optional[Evaluator] = None
+
+
+def init_worker(policy: str, env_kwargs: Optional[dict]):
+    global worker_evaluator
+    worker_evaluator = Evaluator(policy, env_kwargs)
+    if "torch" in sys.modules:  # The workers are the parallelism, one thread each avoids oversubscribing the cores
+        sys.modules["torch"].set_num_threads(1)
+
+
+def run_worker_episodes(seeds: list[int]) -> list[EpisodeResult]:
+    return worker_evaluator.run_episodes(seeds)
+
+
+# Evaluates a policy on every seed and yields the results in the order of the seeds as soon as they are known. The
+# seeds are split into shards of shard_size that are evaluated by a pool of worker processes, every worker keeps one
+# env and loaded policy (workers=1 evaluates in this process). The env settings default to the ones the baseline
+# model was trained with
+def evaluate(policy: str, seeds: Iterable[int], env_kwargs: Optional[dict] = None, workers: Optional[int] = None,
+             shard_size: int = 4) -> Iterator[EpisodeResult]:
+    seeds = list(seeds)
+    if policy != "random":
+        # Fail here instead of in the initializer of every worker, which only reports a broken pool
+        import_ppo()
+        if not os.path.exists(policy):
+            raise FileNotFoundError(f"Policy checkpoint {policy} does not exist")
+    if env_kwargs is None:
+        env_kwargs = {} if policy == "random" else model_env_kwargs(policy)
+    if workers == 1:
+        evaluator = Evaluator(policy, env_kwargs)
+        for seed in seeds:
+            yield evaluator.run_episode(seed)
+        return
+    shards = [seeds[start:start + shard_size] for start in range(0, len(seeds), shard_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(policy, env_kwargs)) as pool:
+        futures = {pool.submit(run_worker_episodes, shard): index for index, shard in enumerate(shards)}
+        finished = {}  # Results of the shards that finished before the shards in front of them
+        next_shard = 0
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                finished[futures[future]] = future.result()
+            while next_shard in finished:
+                yield from finished.pop(next_shard)
+                next_shard += 1
+
+
+# Evaluates a baseline model over a range of seeds and prints the episodes as they finish and the throughput,
+# e.g. python -m hill_racing_env.envs.evaluate ppo_base_aggressive_1000_0.zip --stop 200
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate a policy on a range of terrain seeds")
+    parser.add_argument("policy", help="Path or name in baseline_models of a PPO checkpoint, or 'random'")
+    parser.add_argument("--start", type=int, default=0, help="First seed of the range")
+    parser.add_argument("--stop", type=int, default=100, help="End of the seed range (exclusive)")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--shard-size", type=int, default=4, help="Number of seeds a worker evaluates at once")
+    args = parser.parse_args()
+    if args.stop <= args.start:
+        parser.error(f"the seed range {args.start} to {args.stop} is empty, --stop has to be larger than --start")
+
+    policy = args.policy
+    if policy != "random" and not os.path.exists(policy):
+        policy = os.path.join(BASELINE_MODELS_DIR, policy)
+    results = []
+    start = time.perf_counter()
+    for result in evaluate(policy, range(args.start, args.stop), workers=args.workers, shard_size=args.shard_size):
+        results.append(result)
+        print(f"seed {result.seed}: score {result.score}, {result.steps} steps, {result.end_reason}, "
+              f"airtime {result.total_airtime}, return {result.episode_return:.1f}")
+    duration = time.perf_counter() - start
+    steps = sum(result.steps for result in results)
+    end_reasons = {reason: sum(result.end_reason == reason for result in results)
+                   for reason in ["dead", "stuck", "max_score"]}
+    print(f"{len(results)} episodes, mean score {sum(result.score for result in results) / len(results):.1f}, "
+          f"end reasons {end_reasons}")
+    print(f"{len(results) / duration:.2f} episodes/s, {steps / duration:.0f} env-steps/s")
@@ -1,88 +1,173 @@
 from Box2D import *
+import math
 import numpy as np
-import pygame
-import hill_racing
+from . import hill_racing
 import random
 import noise
-import perlin
+from . import perlin
 from typing import Optional
 
 
+# Calculates the height (y-coordinate in pixels) of every ground vertex in one go, returns a float32 array.
+# Produces exactly the same values as evaluating the terrain point by point with noise.pnoise1 and np.interp.
+# The original noise interpolates between the values of noise_table (perlin.perlin_table), by default perlin.perlin
+def generate_heights(ground_seed: float, distance: int, smoothness: int, original_noise: bool = False,
+                     difficulty: Optional[int] = None, noise_table: Optional[np.ndarray] = None) -> np.ndarray:
+    if difficulty is None:
+        difficulty = hill_racing.DIFFICULTY
+    # Minimum height of ground
+    min_height = 30
+    # Set the length of the flat section of the ground vector, the original noise has no flat section
+    flat_length = 0 if original_noise else 500
+    xs = np.arange(0, distance, smoothness)
+    # Calculate the steepness level by remapping the current distance to a height
+    steepness_level = np.interp(xs, [0, distance], [130, 250])
+    # Calculate the noised_y values using Perlin noise with the starting point and adjusted x values
+    noise_x = ground_seed + (xs - flat_length) / (700 - steepness_level)
+    if original_noise:  # Whether to use the original perlin noise (0 to 1)
+        table = np.asarray(perlin.perlin if noise_table is None else noise_table, dtype=np.float64)
+        noised_y = np.abs(perlin.original_pnoise1_array(noise_x, table))
+    else:  # Use perlin noise from -1 to 1
+        noised_y = np.abs(perlin.pnoise1_array(noise_x, octaves=4)).astype(np.float64)
+    # Determine the maximum heights for the ground vectors based on the steepness level
+    max_height = difficulty + np.interp(steepness_level, [0, 200], [0, 320])
+    # Within the flat section the noise is constant and we add extra height that decreases linearly
+    height_addition = np.zeros(len(xs))
+    flat = xs < flat_length
+    if flat.any():
+        noised_y[flat] = abs(noise.pnoise1(ground_seed, octaves=4))
+        height_addition[flat] = (flat_length - xs[flat]) / 25
+        height_addition[~flat] = height_addition[flat][-1]  # The last height addition carries over
+    # Same as np.interp(noised_y, [0, 1], [min_height, max_height]) for every vector
+    interp_height = np.where(noised_y >= 1, max_height, (max_height - min_height) * noised_y + min_height)
+    return (hill_racing.SCREEN_HEIGHT - interp_height + height_addition).astype(np.float32)
+
+
+# Checks whether the ground climbs too much within a window of lookahead vertices, in linear time.
+# Sums the positive height drops (y decreases upwards) of every window, returns whether the ground is too steep and
+# the x-range (in meters) of the first window that is too steep.
+def check_steepness(vertices: np.ndarray, lookahead: int = 10,
+                    max_climb: float = 5) -> tuple[bool, Optional[tuple[float, float]]]:
+    ys = vertices[:, 1].astype(np.float64)
+    drops = np.maximum(0, ys[:-1] - ys[1:])
+    # Pad with zeros so windows at the end of the ground are cut off, just like getPositions
+    padded_drops = np.concatenate((drops, np.zeros(lookahead - 1)))
+    total_climb = np.zeros(len(drops))
+    for j in range(lookahead - 1):  # Summed in the same order as the original loop, so verdicts are identical
+        total_climb += padded_drops[j:j + len(drops)]
+    too_steep = np.flatnonzero(total_climb > max_climb)
+    if len(too_steep) == 0:
+        return False, None
+    start = too_steep[0]
+    end = min(start + lookahead - 1, len(ys) - 1)
+    return True, (float(vertices[start, 0]), float(vertices[end, 0]))
+
+
+# Number of grounds generated for one seed before giving up on finding ground that is not too steep
+MAX_GROUND_ATTEMPTS = 100
+
+
+# Derives the seed of a retry from the seed of the ground, so the same seed always retries the same grounds
+def retry_seed(seed: int, attempt: int) -> int:
+    return int(np.random.SeedSequence([seed, attempt]).generate_state(1)[0])
+
+
+# Generates the ground of a seed that is not too steep. When the ground of the seed itself is too steep, the grounds of
+# retry seeds derived from it are tried, raises a RuntimeError when none of the max_attempts grounds can be used.
+# Nothing is printed, the x-ranges of the rejected grounds are kept in rejected_ranges of the returned ground
+def generate_ground(seed: int, original_noise: bool = False, difficulty: Optional[int] = None,
+                    max_attempts: int = MAX_GROUND_ATTEMPTS) -> 'Ground':
+    rejected_ranges = []
+    for attempt in range(max_attempts):
+        terrain = Ground(original_noise=original_noise, difficulty=difficulty)
+        # Randomizes the ground using the difficulty and perlin noise
+        terrain.randomize_ground(seed=seed if attempt == 0 else retry_seed(seed, attempt))
+        too_steep, steep_range = terrain.check_steepness()
+        if not too_steep:
+            terrain.seed = seed
+            terrain.rejected_ranges = rejected_ranges
+            return terrain
+        rejected_ranges.append(steep_range)
+    raise RuntimeError(f"Could not generate ground that is not too steep for seed {seed} in {max_attempts} attempts, "
+                       f"try an easier difficulty than {difficulty}")
+
+
 class Ground:
-    def __init__(self, world: b2World = None, original_noise: bool = False):
+    def __init__(self, world: b2World = None, original_noise: bool = False, difficulty: Optional[int] = None):
         self.world = world
         self.id = "ground"
         self.ground_vectors = []
         self.dirtBody = None
         self.grassBody = None
+        self.wallBody = None
         self.distance = hill_racing.GROUND_DISTANCE  # Max distance of the world in pixels
         self.x = 0
         self.y = 0
         self.smoothness = 15
         self.grass_thickness = 5
         self.steepness_Level = 0
-        self.scaled_ground_vectors = []
         self.original_noise = original_noise
+        # Difficulty of the terrain, defaults to hill_racing.DIFFICULTY
+        self.difficulty = hill_racing.DIFFICULTY if difficulty is None else difficulty
+        self.spawning_y = 0  # Spawn location y-coordinate (in pixels) of the agents on this ground
+        self.seed = None  # Seed this ground was generated for by generate_ground
+        self.rejected_ranges = []  # x-ranges of the too steep grounds generate_ground rejected before this one
+        self.vertices = None  # float32 array of the ground vertices in meters, (n, 2)
+        self.heights = None  # Evenly spaced heights (y in meters) of the surface, a view on the vertices
+        self.height_spacing = self.smoothness / hill_racing.SCALE  # Distance between two heights in meters
+        self.pixel_vertices = None  # Surface vertices in pixels for drawing, made on the first draw
+        self.dirt_vertices = None
+        self.grass_vertices = None
+        # Streaming mode, only a window of chunks around the car is added to the world
+        self.streaming = False
+        self.chunk_segments = 64  # Number of ground segments per chunk
+        self.window_chunks = 1  # Number of chunks kept in the world behind and ahead of the car's chunk
+        self.num_chunks = 0
+        self.current_chunk = None  # Chunk indices of the cars at the last window update
+        self.active_chunks = {}  # Chunk index -> (dirt fixture, grass fixture)
 
     def randomize_ground(self, seed: Optional[int] = None):
-        if seed is not None:
-            random.seed(seed)
-        ground_seed = random.uniform(0, 100000)  # Generates a random seed that will define the terrain
-        # Minimum height of ground
-        min_height = 30
-        # Set the length of the flat section of the ground vector
-        flat_length = 500
-        # Initialize a variable to store the additional height for flat ground
-        height_addition = 0
-
-        # Iterate over a range from 0 to self.distance with a step size of self.smoothness
-        for i in range(0, self.distance, self.smoothness):
-            # Calculate the steepness level by remapping the current distance to a height
-            self.steepness_Level = np.interp(i, [0, self.distance], [130, 250])
-            # Calculate the noised_y value using Perlin noise with the starting point and adjusted i value
-            if self.original_noise is True:  # Whether to use the original perlin noise (0 to 1)
-                flat_length = 0
-                noised_y = abs(
-                    perlin.original_pnoise(ground_seed + (i - flat_length) / (700 - self.steepness_Level)))
-            else:  # Use perlin noise from -1 to 1
-                noised_y = abs(
-                    noise.pnoise1(ground_seed + (i - flat_length) / (700 - self.steepness_Level), octaves=4))
-            # Determine the maximum and minimum heights for the ground vector based on the steepness level.
-            max_height = hill_racing.DIFFICULTY + np.interp(self.steepness_Level, [0, 200], [0, 320])
-            # Function where difficulty increases till the end
-            # max_height = hill_racing.DIFFICULTY + np.interp(self.steepness_Level, [0, 250], [0, 320])
-            # If value is less than the flat section length, recalculate noised_y and height_addition
-            if i < flat_length:
-                noised_y = abs(noise.pnoise1(ground_seed, octaves=4))
-                height_addition = (flat_length - i) / 25
-            # Create the ground vector with x-value i and adjusted y-value based on noised_y
-            self.ground_vectors.append(
-                b2Vec2(i, hill_racing.SCREEN_HEIGHT -
-                       np.interp(noised_y, [0, 1], [min_height, max_height]) + height_addition))
-
-        self.ground_vectors.append(b2Vec2(self.distance, hill_racing.SCREEN_HEIGHT))  # End point vector
-        self.ground_vectors.append(b2Vec2(0, hill_racing.SCREEN_HEIGHT))  # Starting point vector
-        hill_racing.SPAWNING_Y = self.ground_vectors[10].y - 100  # Calculate spawn location
-
-        for vect in self.ground_vectors:
-            vect.x /= hill_racing.SCALE
-            vect.y /= hill_racing.SCALE
+        # A seeded generator of our own, reseeding the shared random module would race with other envs
+        rng = random if seed is None else random.Random(seed)
+        ground_seed = rng.uniform(0, 100000)  # Generates a random seed that will define the terrain
+        # The original noise gets its own table from the same generator, so it is reproducible from the seed
+        noise_table = perlin.perlin_table(rng) if self.original_noise else None
+        # Calculate the whole height profile (in pixels) of the terrain at once
+        heights = generate_heights(ground_seed, self.distance, self.smoothness, self.original_noise, self.difficulty,
+                                   noise_table)
+        self.spawning_y = float(heights[10]) - 100  # Calculate spawn location
+        self.set_vertices(heights)
+
+    # Function that converts a height profile in pixels to the (meter scaled) ground vertices and vectors
+    def set_vertices(self, heights: np.ndarray):
+        xs = np.arange(0, self.distance, self.smoothness, dtype=np.float32)
+        vertices = np.empty((len(heights) + 2, 2), dtype=np.float32)
+        vertices[:-2, 0] = xs
+        vertices[:-2, 1] = heights
+        vertices[-2] = (self.distance, hill_racing.SCREEN_HEIGHT)  # End point vector
+        vertices[-1] = (0, hill_racing.SCREEN_HEIGHT)  # Starting point vector
+        # Scale to meters, Box2D vectors are float32 but the division itself is done in double precision
+        self.load_vertices((vertices.astype(np.float64) / hill_racing.SCALE).astype(np.float32))
+
+    # Function that sets the (meter scaled) ground vertices, for example from a terrain bank
+    def load_vertices(self, vertices: np.ndarray):
+        self.vertices = vertices
+        self.heights = vertices[:-2, 1]  # Without the two closing vertices at the bottom of the screen
+        self.pixel_vertices = None
+        self.ground_vectors = [b2Vec2(x, y) for x, y in vertices.tolist()]
+
+    # Function to see if ground is too steep, also returns the x-range of the steep part
+    def check_steepness(self) -> tuple[bool, Optional[tuple[float, float]]]:
+        return check_steepness(self.vertices)
 
     # Function to see if ground is too steep
     def groundTooSteep(self):
-        for vector in self.ground_vectors:
-            oi = self.getPositions(vector.x, 10, 1)
-            total_difference = 0
-            for i in range(1, len(oi)):
-                total_difference += max(0, oi[i - 1] - oi[i])
-            if total_difference > 5:
-                print(total_difference)
-                print("Too Steep, generating new ground!")
-                return True
-        return False
+        return self.check_steepness()[0]
 
     # returns a list of Y positions directly after the input x.
-    # the list contains numberOfPositions Y values which represent the upcoming hills
+    # the list contains numberOfPositions Y values which represent the upcoming hills.
+    # At the end of the ground the closing vectors at the bottom of the screen follow the surface (the original
+    # steepness check counts them, see benchmark.legacy_ground_too_steep), past the end point its height is repeated
     def getPositions(self, x: int, numberOfPositions: int, skip: int):
         returnList = []
         for i in range(len(self.ground_vectors)):
@@ -90,32 +175,98 @@ class Ground:
                 for j in range(0, min(skip * numberOfPositions, len(self.ground_vectors) - i), skip):
                     returnList.append(self.ground_vectors[i + j].y)
                 break
+        if not returnList:  # Past the end point of the ground
+            returnList.append(self.ground_vectors[-2].y)
         while len(returnList) < numberOfPositions:
             returnList.append(returnList[-1])  # append last element to list again
         return returnList
 
+    # Returns the heights (y in meters) of count surface vertices from x onwards, taking every skip-th vertex.
+    # Equals getPositions on the surface, but past the last surface vertex its height is repeated instead of following
+    # the closing vectors to the bottom of the screen. Looks up the first vertex in O(1) instead of a scan.
+    def heights_ahead(self, x: float, count: int, skip: int = 1) -> np.ndarray:
+        start = min(max(0, math.ceil(x / self.height_spacing)), len(self.heights) - 1)  # First vertex at or after x
+        ahead = self.heights[start:start + skip * count:skip]
+        if len(ahead) < count:
+            ahead = np.concatenate((ahead, np.full(count - len(ahead), self.heights[-1], dtype=np.float32)))
+        return ahead
+
     # Clone vector values from the otherGround world to current object
     def cloneFrom(self, otherGround: 'Ground'):
+        self.vertices = otherGround.vertices
+        self.heights = otherGround.heights
+        self.pixel_vertices = otherGround.pixel_vertices
+        self.spawning_y = otherGround.spawning_y
+        self.seed = otherGround.seed
+        self.rejected_ranges = otherGround.rejected_ranges
+        self.difficulty = otherGround.difficulty
+        self.original_noise = otherGround.original_noise
         for v in otherGround.ground_vectors:
-            self.ground_vectors.append(pygame.Vector2(v.x, v.y))
+            self.ground_vectors.append(b2Vec2(v.x, v.y))
 
-    def setBodies(self, worldToAddTo: b2World):
+    def setBodies(self, worldToAddTo: b2World, streaming: bool = False):
         self.world = worldToAddTo
         self.makeBody()
-        for i in range(1, len(self.ground_vectors)):
-            self.addEdge(self.ground_vectors[i - 1], self.ground_vectors[i], hill_racing.DIRT_MASK,
-                         hill_racing.DIRT_CATEGORY, False)
-
-        for i in range(1, len(self.ground_vectors)):
-            self.addEdge(
-                b2Vec2(self.ground_vectors[i - 1].x,
-                       self.ground_vectors[i - 1].y - self.grass_thickness / hill_racing.SCALE),
-                b2Vec2(self.ground_vectors[i].x,
-                       self.ground_vectors[i].y - self.grass_thickness / hill_racing.SCALE),
-                hill_racing.GRASS_MASK, hill_racing.GRASS_CATEGORY, True)
+        self.streaming = streaming
+        self.dirt_vertices = self.vertices
+        self.grass_vertices = (self.vertices - np.array([0, self.grass_thickness / hill_racing.SCALE])).astype(
+            np.float32)
+        if streaming:  # Chunks of the surface are only added to the world when the car comes near, see update_window
+            self.active_chunks = {}
+            self.num_chunks = -(-(len(self.vertices) - 3) // self.chunk_segments)  # Ceil division
+            # The closing edges (down at the end and back along the bottom of the screen) span the whole ground, the
+            # bottom edge is the floor wherever the surface dips below it, so they are always in the world
+            closing = (len(self.vertices) - 3, len(self.vertices) - 1)
+            self.addChain(self.dirt_vertices, hill_racing.DIRT_MASK, hill_racing.DIRT_CATEGORY, False, closing)
+            self.addChain(self.grass_vertices, hill_racing.GRASS_MASK, hill_racing.GRASS_CATEGORY, True, closing)
+        else:  # One chain shape per body instead of an edge fixture per segment
+            self.addChain(self.dirt_vertices, hill_racing.DIRT_MASK, hill_racing.DIRT_CATEGORY, False)
+            self.addChain(self.grass_vertices, hill_racing.GRASS_MASK, hill_racing.GRASS_CATEGORY, True)
         # Create an invisible wall at spawn
         self.create_invisible_wall()
 
+    # Streaming mode: makes sure only the chunks within window_chunks of the chunks of the cars are in the world.
+    # The edges near the cars are the same as the full ground, but not the order the cars collide with them in: Box2D
+    # orders new contacts by the ids of their broad-phase proxies, and chunks added after the car or reusing the ids of
+    # retired chunks get other ids than the full chain. The contacts are solved in another order and after a while a
+    # trajectory drifts away from the one on the full ground
+    def update_window(self, *positions_x: float):
+        if not self.streaming:
+            return
+        chunk_width = self.chunk_segments * self.smoothness / hill_racing.SCALE
+        current_chunks = tuple(int(pos_x // chunk_width) for pos_x in positions_x)
+        if current_chunks == self.current_chunk:
+            return
+        self.current_chunk = current_chunks
+        wanted_chunks = set()
+        for current_chunk in current_chunks:
+            wanted_chunks.update(range(max(0, current_chunk - self.window_chunks),
+                                       min(self.num_chunks, current_chunk + self.window_chunks + 1)))
+        # Retire chunks that are too far behind or ahead
+        for chunk in set(self.active_chunks) - wanted_chunks:
+            dirt_fixture, grass_fixture = self.active_chunks.pop(chunk)
+            self.dirtBody.DestroyFixture(dirt_fixture)
+            self.grassBody.DestroyFixture(grass_fixture)
+        # Add the chunks that came into the window
+        for chunk in sorted(wanted_chunks - set(self.active_chunks)):
+            start = chunk * self.chunk_segments
+            segments = (start, min(start + self.chunk_segments, len(self.vertices) - 3))  # Surface vertices only
+            self.active_chunks[chunk] = (
+                self.addChain(self.dirt_vertices, hill_racing.DIRT_MASK, hill_racing.DIRT_CATEGORY, False, segments),
+                self.addChain(self.grass_vertices, hill_racing.GRASS_MASK, hill_racing.GRASS_CATEGORY, True, segments)
+            )
+
+    # Function that removes all ground bodies from the world
+    def destroyBodies(self):
+        self.world.DestroyBody(self.grassBody)
+        self.world.DestroyBody(self.dirtBody)
+        self.world.DestroyBody(self.wallBody)
+        self.grassBody = None
+        self.dirtBody = None
+        self.wallBody = None
+        self.active_chunks = {}
+        self.current_chunk = None
+
     # Function that creates an invisible wall at spawn
     def create_invisible_wall(self):
         wall_body = b2BodyDef(
@@ -129,9 +280,9 @@ class Ground:
             restitution=0,
             shape=b2PolygonShape(box=(4, 10000))
         )
-        invisible_wall = self.world.CreateBody(wall_body)
-        invisible_wall.userData = self
-        invisible_wall.CreateFixture(wall_fixture)
+        self.wallBody = self.world.CreateBody(wall_body)
+        self.wallBody.userData = self
+        self.wallBody.CreateFixture(wall_fixture)
 
     def makeBody(self):
         bodyDef = b2BodyDef(
@@ -143,47 +294,58 @@ class Ground:
         self.dirtBody.userData = self
         self.grassBody.userData = self
 
-    def addEdge(self, vec1: b2Vec2, vec2: b2Vec2, mask: int, category: int, isGrass: bool):
+    # Adds the vertices as one open chain of edges to the grass or dirt body, either all vertices or the edges between
+    # the vertices start and end of segments. The neighbouring vertices of a part are set as ghost vertices, so the
+    # part collides exactly like the full chain.
+    def addChain(self, vertices: np.ndarray, mask: int, category: int, isGrass: bool,
+                 segments: Optional[tuple[int, int]] = None) -> b2Fixture:
+        if segments is None:
+            shape = b2ChainShape(vertices_chain=vertices.tolist())
+        else:
+            start, end = segments
+            shape = b2ChainShape(vertices_chain=vertices[start:end + 1].tolist())
+            if start > 0:
+                shape.SetPrevVertex(b2Vec2(*vertices[start - 1].tolist()))
+            if end < len(vertices) - 1:
+                shape.SetNextVertex(b2Vec2(*vertices[end + 1].tolist()))
         fixDef = b2FixtureDef(
             categoryBits=category,
             maskBits=mask,
             friction=0.99,
             restitution=0.1,
-            shape=b2EdgeShape()
+            shape=shape
         )
 
-        # Use vertices instead of SetAsEdge
-        fixDef.shape.vertices = [vec1, vec2]
-
         if isGrass:
-            self.grassBody.CreateFixture(fixDef)
+            return self.grassBody.CreateFixture(fixDef)
         else:
-            self.dirtBody.CreateFixture(fixDef)
+            return self.dirtBody.CreateFixture(fixDef)
 
-    def draw_ground(self, surface_screen):
+    def draw_ground(self, surface_screen, pan_x: float = 0, pan_y: float = 0):
+        import pygame  # Only imported when rendering, so headless training never loads pygame
         # Light brown
         # ground_color = (102, 50, 20);
         # Brown
         ground_color = (88, 35, 0)
         grass_color = (0, 120, 0)
-        vertices = []
-
-        # If the scaled_ground_vectors have not yet been initialized (improves rendering performance)
-        if not self.scaled_ground_vectors:
-            self.scaled_ground_vectors = self.ground_vectors
-            for vect in self.scaled_ground_vectors:
-                vect.x *= hill_racing.SCALE
-                vect.y *= hill_racing.SCALE
-
-        # Beginning vertices
-        vertices.append((0 - hill_racing.panX, hill_racing.SCREEN_HEIGHT + self.grass_thickness * 2 - hill_racing.panY))
-        for i in range(0, len(self.scaled_ground_vectors) - 2):  # Add offset to render current ground to current screen
-            vertices.append(
-                (self.scaled_ground_vectors[i].x - hill_racing.panX,
-                 self.scaled_ground_vectors[i].y - hill_racing.panY))
-        # Append end vertices of screen
-        vertices.append(
-            (self.distance - hill_racing.panX, hill_racing.SCREEN_HEIGHT + self.grass_thickness * 2 - hill_racing.panY))
+
+        # Scale the surface vertices to pixels once, a separate copy so the physics vertices are never modified.
+        # Scaled in float32 like the Box2D vectors used to be, so the ground is drawn on exactly the same pixels
+        if self.pixel_vertices is None:
+            self.pixel_vertices = (self.vertices[:-2] * np.float32(hill_racing.SCALE)).astype(np.float64)
+        xs = self.pixel_vertices[:, 0]
+
+        # Only draw the vertices on screen, with a margin so the sides of the polygon and their grass outline stay
+        # off-screen. Binary search for the first and last vertex of the visible range.
+        margin = self.smoothness + self.grass_thickness * 2
+        start = max(0, int(np.searchsorted(xs, pan_x - margin, side="right")) - 1)
+        end = min(len(xs), int(np.searchsorted(xs, pan_x + hill_racing.SCREEN_WIDTH + margin, side="left")) + 1)
+        # The polygon is closed at the bottom of the screen at the ends of the ground, the same corners as the full
+        # ground, so the bottom edge and its grass outline end on the same pixels
+        bottom_y = hill_racing.SCREEN_HEIGHT + self.grass_thickness * 2 - pan_y
+        vertices = [(0 - pan_x, bottom_y)]
+        vertices.extend((self.pixel_vertices[start:end] - (pan_x, pan_y)).tolist())
+        vertices.append((self.distance - pan_x, bottom_y))
 
         # Draw the hills
         # Fill the base ground until the first layer of ground
@@ -193,32 +355,32 @@ class Ground:
         # Draw the transition colours from ground to grass (down to up)
         # for i in range(len(self.ground_vectors) - 3):
         #     pygame.draw.line(surface_screen, (66, 60, 0),
-        #                      (self.ground_vectors[i].x * hill_racing.SCALE - hill_racing.panX,
-        #                       self.ground_vectors[i].y * hill_racing.SCALE + 9 - hill_racing.panY),
-        #                      (self.ground_vectors[i + 1].x * hill_racing.SCALE - hill_racing.panX,
-        #                       self.ground_vectors[i + 1].y * hill_racing.SCALE + 9 - hill_racing.panY),
+        #                      (self.ground_vectors[i].x * hill_racing.SCALE - pan_x,
+        #                       self.ground_vectors[i].y * hill_racing.SCALE + 9 - pan_y),
+        #                      (self.ground_vectors[i + 1].x * hill_racing.SCALE - pan_x,
+        #                       self.ground_vectors[i + 1].y * hill_racing.SCALE + 9 - pan_y),
         #                      3)
         #
         # for i in range(len(self.ground_vectors) - 3):
         #     pygame.draw.line(surface_screen, (44, 90, 0),
-        #                      (self.ground_vectors[i].x * hill_racing.SCALE - hill_racing.panX,
-        #                       self.ground_vectors[i].y * hill_racing.SCALE + 6 - hill_racing.panY),
-        #                      (self.ground_vectors[i + 1].x * hill_racing.SCALE - hill_racing.panX,
-        #                       self.ground_vectors[i + 1].y * hill_racing.SCALE + 6 - hill_racing.panY),
+        #                      (self.ground_vectors[i].x * hill_racing.SCALE - pan_x,
+        #                       self.ground_vectors[i].y * hill_racing.SCALE + 6 - pan_y),
+        #                      (self.ground_vectors[i + 1].x * hill_racing.SCALE - pan_x,
+        #                       self.ground_vectors[i + 1].y * hill_racing.SCALE + 6 - pan_y),
         #                      3)
         #
         # for i in range(len(self.ground_vectors) - 3):
         #     pygame.draw.line(surface_screen, (0, 140, 0),
-        #                      (self.ground_vectors[i].x * hill_racing.SCALE - hill_racing.panX,
-        #                       self.ground_vectors[i].y * hill_racing.SCALE - 5 - hill_racing.panY),
-        #                      (self.ground_vectors[i + 1].x * hill_racing.SCALE - hill_racing.panX,
-        #                       self.ground_vectors[i + 1].y * hill_racing.SCALE - 5 - hill_racing.panY),
+        #                      (self.ground_vectors[i].x * hill_racing.SCALE - pan_x,
+        #                       self.ground_vectors[i].y * hill_racing.SCALE - 5 - pan_y),
+        #                      (self.ground_vectors[i + 1].x * hill_racing.SCALE - pan_x,
+        #                       self.ground_vectors[i + 1].y * hill_racing.SCALE - 5 - pan_y),
         #                      3)
         #
         # for i in range(len(self.ground_vectors) - 3):
         #     pygame.draw.line(surface_screen, (0, 130, 0),
-        #                      (self.ground_vectors[i].x * hill_racing.SCALE - hill_racing.panX,
-        #                       self.ground_vectors[i].y * hill_racing.SCALE - 3 - hill_racing.panY),
-        #                      (self.ground_vectors[i + 1].x * hill_racing.SCALE - hill_racing.panX,
-        #                       self.ground_vectors[i + 1].y * hill_racing.SCALE - 3 - hill_racing.panY),
+        #                      (self.ground_vectors[i].x * hill_racing.SCALE - pan_x,
+        #                       self.ground_vectors[i].y * hill_racing.SCALE - 3 - pan_y),
+        #                      (self.ground_vectors[i + 1].x * hill_racing.SCALE - pan_x,
+        #                       self.ground_vectors[i + 1].y * hill_racing.SCALE - 3 - pan_y),
         #                      3)
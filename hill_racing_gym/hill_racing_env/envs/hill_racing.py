@@ -4,14 +4,21 @@ try:
     from Box2D import *
 except ImportError:
     raise DependencyNotInstalled("box2d is not installed, try 'pip install box2d box2d-kengz'")
-import pygame
 import gymnasium as gym
 from gymnasium import spaces
-from typing import Optional
+from typing import NamedTuple, Optional, Sequence, TYPE_CHECKING
 import numpy as np
 import math
-import ground
-import agent
+from . import ground
+from . import agent
+from . import snapshot
+from . import state_recorder
+from . import terrain_bank
+from . import trajectory_recorder
+
+if TYPE_CHECKING:  # Rendering modules, imported on the first render so headless training never loads pygame
+    import pygame
+    from . import sprite_atlas
 
 # collisionCategories represented in bits
 WHEEL_CATEGORY = 0x0001
@@ -27,8 +34,10 @@ GRASS_MASK = (WHEEL_CATEGORY | PERSON_CATEGORY)
 DIRT_MASK = CHASSIS_CATEGORY
 PERSON_MASK = GRASS_CATEGORY
 
+# collisionGroup, fixtures of cars share a negative group index so cars never collide with each other (or themselves)
+CAR_GROUP = -1
+
 # Fundamental constants (not recommended to change)
-SPAWNING_Y = 0  # Spawn location y-coordinate (in pixels), is calculated in ground class
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 SCALE = 30  # Pixels per meter / Scale, Box2D counts in meters, pygame counts in pixels.
@@ -38,23 +47,113 @@ WHEEL_SIZE = 35
 HEAD_SIZE = 40
 PERSON_WIDTH = 20
 PERSON_HEIGHT = 40
-panX = 0
-panY = 0
 
 # Gameplay variables
 SPAWNING_X = 200  # Spawn location x-coordinate (in pixels)
 MAX_SCORE = 1000  # Max score achievable (-/+ 10)
 GROUND_DISTANCE = int(MAX_SCORE * SCALE + SPAWNING_X)  # How long the ground terrain should in pixel size
-DIFFICULTY = -150  # Difficulty of terrain, max 30, min -230 (almost flat terrain), -150 is normal difficulty
-
-# Load in pictures/sprites
-wheel_sprite = pygame.image.load("pictures/wheel.png")
-head_sprite = pygame.image.load("pictures/headLarge2.png")
-car_sprite = pygame.image.load("pictures/car.png")
-torso_sprite = pygame.image.load("pictures/torsoLarge.png")
+# Physics profiles: Box2D solver iterations of a world step, world steps per frame (1 / FPS seconds) and frames per
+# env step. "accurate" is the original simulation, "fast" uses the Box2D default iterations
+PHYSICS_PROFILES = {
+    "accurate": {"velocity_iterations": 6 * 30, "position_iterations": 2 * 30, "sub_steps": 1, "frame_skip": 1},
+    "fast": {"velocity_iterations": 8, "position_iterations": 3, "sub_steps": 1, "frame_skip": 1}
+}
+DIFFICULTY = -150  # Default difficulty of terrain, max 30, min -230 (almost flat terrain), -150 is normal difficulty
+# Info returned by step: "none" is always empty, "summary" only has the stats of an episode on its last step and
+# "full" has the state of the car every step and the stats of the episode on its last step
+INFO_LEVELS = ["none", "summary", "full"]
+# Counters of the env at the start of a state snapshot, followed by the state of the agent (see snapshot). The ground
+# seed is split into two 32-bit halves, so float64 holds every seed below 2**64 exactly
+ENV_STATE_FIELDS = ["ground_seed_high", "ground_seed_low", "step_counter", "step_stuck_counter", "previous_stuck_pos",
+                    "total_airtime_counter"]
+MAX_STATE_SEED = 2 ** 64 - 1
+
+
+# Position in pixels, the spawn position of a body
+class Position(NamedTuple):
+    x: float
+    y: float
+
+
+# Layout of a flat observation: chassis position (x, y), chassis angle, wheel speeds (back, front), on ground flags
+FLAT_OBS_LOW = np.array([0, 0, 0, -13 * math.pi - 0.1, -13 * math.pi - 0.1, 0, 0], dtype=np.float32)
+FLAT_OBS_HIGH = np.array([1000, 700, 360, 13 * math.pi + 0.1, 13 * math.pi + 0.1, 1, 1], dtype=np.float32)
+# Optional extra features that are appended to a flat observation, name -> (size, low, high). Terrain features have
+# one value for every lookahead point (size None): the terrain height relative to the chassis (up is positive, meters)
+# and the slope towards the next lookahead point (uphill is positive)
+FLAT_OBS_EXTRAS = {
+    "chassis_velocity": (2, -np.inf, np.inf),  # Linear velocity of the chassis in m/s
+    "chassis_angular_velocity": (1, -np.inf, np.inf),  # Angular velocity of the chassis in rad/s
+    "airtime": (1, 0, np.inf),  # Airtime counter of the agent
+    "terrain_heights": (None, -np.inf, np.inf),
+    "terrain_slopes": (None, -np.inf, np.inf)
+}
+
+
+# Returns the low and high bounds of a flat observation with the given extra features
+def flat_observation_bounds(extras: Sequence[str] = (), lookahead: int = 10) -> tuple[np.ndarray, np.ndarray]:
+    unknown_extras = [extra for extra in extras if extra not in FLAT_OBS_EXTRAS]
+    if unknown_extras:
+        raise ValueError(f"Unknown observation extras {unknown_extras}, choose from {list(FLAT_OBS_EXTRAS)}")
+    low = [FLAT_OBS_LOW]
+    high = [FLAT_OBS_HIGH]
+    for extra in extras:
+        size, extra_low, extra_high = FLAT_OBS_EXTRAS[extra]
+        low.append(np.full(lookahead if size is None else size, extra_low, dtype=np.float32))
+        high.append(np.full(lookahead if size is None else size, extra_high, dtype=np.float32))
+    return np.concatenate(low), np.concatenate(high)
+
+
+# Writes the flat observation of an agent into the float32 buffer out, the extra features follow the base features.
+# Terrain features look at every lookahead_skip-th ground vertex ahead of the car
+def write_flat_observation(out: np.ndarray, racer: 'agent.Agent', extras: Sequence[str] = (),
+                           terrain: Optional['ground.Ground'] = None, lookahead: int = 10, lookahead_skip: int = 1):
+    car = racer.car
+    back_wheel, front_wheel = car.wheels
+    out[0] = car.pos_x
+    out[1] = car.pos_y
+    out[2] = math.degrees(-car.chassis_body.angle) % 360
+    out[3] = back_wheel.joint.speed
+    out[4] = front_wheel.joint.speed
+    out[5] = back_wheel.on_ground
+    out[6] = front_wheel.on_ground
+    i = len(FLAT_OBS_LOW)
+    for extra in extras:
+        match extra:
+            case "chassis_velocity":
+                velocity = car.chassis_body.linearVelocity
+                out[i] = velocity.x
+                out[i + 1] = velocity.y
+                i += 2
+            case "chassis_angular_velocity":
+                out[i] = car.chassis_body.angularVelocity
+                i += 1
+            case "airtime":
+                out[i] = racer.airtime_counter
+                i += 1
+            case "terrain_heights":
+                # Pygame y-axis points down, so the height above the chassis is the chassis y minus the ground y
+                np.subtract(car.pos_y, terrain.heights_ahead(car.pos_x, lookahead, lookahead_skip),
+                            out=out[i:i + lookahead])
+                i += lookahead
+            case "terrain_slopes":
+                heights = terrain.heights_ahead(car.pos_x, lookahead + 1, lookahead_skip)
+                np.divide(heights[:-1] - heights[1:], lookahead_skip * terrain.height_spacing,
+                          out=out[i:i + lookahead])
+                i += lookahead
+
+
+# Draws one frame of the sky, the ground and an agent, the camera follows the pan of the agent
+def draw_scene(surface: 'pygame.Surface', terrain: 'ground.Ground', racer: 'agent.Agent',
+               atlas: 'sprite_atlas.SpriteAtlas'):
+    # Fill screen with sky colour
+    surface.fill((135, 206, 235))
+    # Draw the ground to screen
+    terrain.draw_ground(surface, racer.pan_x, racer.pan_y)
+    # Draw the agent
+    racer.draw_agent(surface, atlas)
 
 
-# Contact listener for head and ground (Bad code)
 class ContactListener(b2ContactListener):
     def __init__(self):
         b2ContactListener.__init__(self)
@@ -79,21 +178,21 @@ class ContactListener(b2ContactListener):
 
         # Check if we contact the wheel with the ground or vice versa.
         if contact.fixtureA.body.userData.id == "wheel" and contact.fixtureB.body.userData.id == "ground":
-            contact.fixtureA.body.userData.on_ground = True
+            contact.fixtureA.body.userData.add_ground_contact()
         if contact.fixtureB.body.userData.id == "wheel" and contact.fixtureA.body.userData.id == "ground":
-            contact.fixtureB.body.userData.on_ground = True
+            contact.fixtureB.body.userData.add_ground_contact()
 
     def EndContact(self, contact: b2Contact) -> None:
-        # End of contact, we need to set the on_ground variable on false
+        # End of contact, the wheel is no longer on the ground when this was its last contact with the ground
         if contact.fixtureA.body.userData.id == "wheel" and contact.fixtureB.body.userData.id == "ground":
-            contact.fixtureA.body.userData.on_ground = False
+            contact.fixtureA.body.userData.remove_ground_contact()
         if contact.fixtureB.body.userData.id == "wheel" and contact.fixtureA.body.userData.id == "ground":
-            contact.fixtureB.body.userData.on_ground = False
+            contact.fixtureB.body.userData.remove_ground_contact()
 
 
 class HillRacingEnv(gym.Env):
     metadata = {
-        "render_modes": ["human"],
+        "render_modes": ["human", "rgb_array"],
         "render_fps": FPS
     }
 
@@ -104,12 +203,27 @@ class HillRacingEnv(gym.Env):
             reward_function: str = "distance",
             reward_type: str = "aggressive",
             max_steps: int = metadata["render_fps"] * 20,
-            original_noise: bool = False
+            original_noise: bool = False,
+            terrain_bank: Optional[str] = None,
+            streaming_ground: bool = False,
+            difficulty: int = DIFFICULTY,
+            physics_profile: str = "accurate",
+            physics_config: Optional[dict] = None,
+            action_repeat: Optional[int] = None,
+            observation_mode: str = "dict",
+            observation_extras: Sequence[str] = (),
+            terrain_lookahead: int = 10,
+            terrain_lookahead_skip: int = 1,
+            trajectory_mode: str = "off",
+            trajectory_length: int = metadata["render_fps"] * 20,
+            info_level: str = "full",
+            record_states: bool = False
     ):
         self.world = b2World(gravity=(0, GRAVITY), doSleep=True)
         self.ground: Optional[ground.Ground] = None  # List of ground that needs to be generated
+        self.ground_seed = None  # Seed of the current ground, the ground is reused when we reset with the same seed
         self.agent: Optional[agent.Agent] = None  # The agent class contains the car, wheels and person
-        self.difficulty = DIFFICULTY  # Difficulty of the env, scales from -250 to 80 (easiest to hardest)
+        self.difficulty = difficulty  # Difficulty of the env, scales from -250 to 80 (easiest to hardest)
         self.action_space_type = action_space  # What type of action space do we choose? (Discrete or continuous?)
         self.reward_function = reward_function  # Type of reward, distance-based vs action based vs wheel speed
         self.step_stuck_counter = None  # Counter to memorize the amount of steps done for when the agent is stuck
@@ -117,10 +231,40 @@ class HillRacingEnv(gym.Env):
         self.max_steps = max_steps  # Amount of maximum timesteps done without significant
         self.previous_stuck_pos = None  # Position of the agent last time the agent was stuck
         self.total_airtime_counter = None  # Counts the total amount of airtime
-        self.position_list = []  # List of all positions in a list
+        # Records the positions of the episode, delivered in the info of the last step ("off", "ring" or "full").
+        # The ring keeps the last trajectory_length frames, for a full trajectory it is the initial size of the buffer
+        self.trajectory = trajectory_recorder.TrajectoryRecorder(trajectory_mode, trajectory_length)
+        # Records the body states of every frame, to render the episode afterwards (see state_recorder)
+        self.state_recorder = state_recorder.StateRecorder() if record_states else None
+        if info_level not in INFO_LEVELS:
+            raise ValueError(f"Unknown info level {info_level}, choose from {INFO_LEVELS}")
+        self.info_level = info_level
         self.reward_type = reward_type
         self.original_noise = original_noise
         # progress, will be 20 seconds
+        self.terrain_bank_path = terrain_bank  # Path to a bank of pre-generated terrain, used for seeds in the bank
+        self.terrain_bank = None  # The terrain bank is memory-mapped when the env is first reset
+        self.streaming_ground = streaming_ground  # Only keep the ground near the car in the world
+        # Physics profile, "custom" takes the settings of physics_config and the accurate profile for the rest
+        self.physics_profile = physics_profile
+        if physics_profile == "custom":
+            unknown_settings = set(physics_config or {}) - set(PHYSICS_PROFILES["accurate"])
+            if unknown_settings:
+                raise ValueError(f"Unknown physics settings {sorted(unknown_settings)}, "
+                                 f"choose from {list(PHYSICS_PROFILES['accurate'])}")
+            physics = dict(PHYSICS_PROFILES["accurate"], **(physics_config or {}))
+        elif physics_profile in PHYSICS_PROFILES:
+            physics = PHYSICS_PROFILES[physics_profile]
+        else:
+            raise ValueError(f"Unknown physics profile {physics_profile}, "
+                             f"choose from {list(PHYSICS_PROFILES) + ['custom']}")
+        self.velocity_iterations = int(physics["velocity_iterations"])
+        self.position_iterations = int(physics["position_iterations"])
+        self.sub_steps = int(physics["sub_steps"])  # World steps per frame
+        # Frames simulated with the same action per step, action_repeat overrides the frame skip of the profile
+        self.action_repeat = int(physics["frame_skip"] if action_repeat is None else action_repeat)
+        if self.action_repeat < 1:
+            raise ValueError(f"Action repeat must be at least 1, got {self.action_repeat}")
 
         # Define action spaces
         match self.action_space_type:  # For experiments
@@ -129,73 +273,126 @@ class HillRacingEnv(gym.Env):
                                                     start=0)  # 3 do-able actions: gas, reverse, 3rd action is idling
             case "continuous":  # Continuous motor wheel speeds
                 self.action_space = gym.spaces.Box(low=-13, high=13, shape=(1,), dtype=np.float32)
-        # Define the observation space
-        self.observation_space = spaces.Dict(
-            {
-                # x coordinate from 0 to 1000 and y from 0 to 700.
-                "chassis_position": spaces.Box(low=np.array([0, 0]), high=np.array([1000, 700]), shape=(2,),
+        # Define the observation space, a dict of named features or one flat float32 box
+        self.observation_mode = observation_mode
+        self.observation_extras = tuple(observation_extras)
+        self.terrain_lookahead = terrain_lookahead  # Number of ground vertices ahead in the terrain features
+        self.terrain_lookahead_skip = terrain_lookahead_skip  # Take every skip-th vertex, vertices are 0.5 m apart
+        if observation_mode == "flat":
+            low, high = flat_observation_bounds(self.observation_extras, terrain_lookahead)
+            self.observation_space = spaces.Box(low=low, high=high, dtype=np.float32)
+            self._observation = np.zeros(len(low), dtype=np.float32)  # Buffer the observations are written to
+        elif observation_mode != "dict":
+            raise ValueError(f"Unknown observation mode {observation_mode}, choose from ['dict', 'flat']")
+        elif self.observation_extras:
+            raise ValueError("Observation extras are only supported by the flat observation mode")
+        else:
+            self.observation_space = spaces.Dict(
+                {
+                    # x coordinate from 0 to 1000 and y from 0 to 700.
+                    "chassis_position": spaces.Box(low=np.array([0, 0]), high=np.array([1000, 700]), shape=(2,),
+                                                   dtype=np.float32),
+                    # Angle in degrees, can be -360 to 360.
+                    "chassis_angle": spaces.Box(low=0, high=360, shape=(1,), dtype=np.float32),
+                    # Wheels speed, back and front wheel have same speed limits, add 0.1 to avoid precision errors
+                    "wheels_speed": spaces.Box(low=-13 * math.pi - 0.1, high=13 * math.pi + 0.1, shape=(2,),
                                                dtype=np.float32),
-                # Angle in degrees, can be -360 to 360.
-                "chassis_angle": spaces.Box(low=0, high=360, shape=(1,), dtype=np.float32),
-                # Wheels speed, back and front wheel have same speed limits, add 0.1 to avoid precision errors
-                "wheels_speed": spaces.Box(low=-13 * math.pi - 0.1, high=13 * math.pi + 0.1, shape=(2,),
-                                           dtype=np.float32),
-                # When one of the wheels is makes contact with the ground, 0 means no contact and 1 means contact
-                "on_ground": spaces.MultiBinary(n=2)
-            }
-        )
+                    # When one of the wheels is makes contact with the ground, 0 means no contact and 1 means contact
+                    "on_ground": spaces.MultiBinary(n=2)
+                }
+            )
 
         assert render_mode is None or render_mode in self.metadata["render_modes"]
         self.render_mode = render_mode
-        self.screen: Optional[pygame.Surface] = None
+        self.screen: Optional['pygame.Surface'] = None
+        self._frame: Optional[np.ndarray] = None  # Pixels of the off-screen surface in rgb_array mode
+        self.sprite_atlas: Optional['sprite_atlas.SpriteAtlas'] = None  # Scaled and rotated sprites, made on render
         self.clock = None
 
-    def _destroy_world(self):
-        if not self.ground:
-            return
+    def _destroy_world(self, keep_ground: bool = False):
         self.world.contactListener = None
-        # Destroy ground bodies
-        self.world.DestroyBody(self.ground.grassBody)
-        self.world.DestroyBody(self.ground.dirtBody)
-        self.ground = None
+        # Destroy ground bodies, unless we reuse the ground of the same seed
+        if self.ground and not keep_ground:
+            self.ground.destroyBodies()
+            self.ground = None
+            self.ground_seed = None
         if not self.agent:
             return
         # Function that destroys the whole agent, which means, car, person and wheels
         self.agent.destroy_agent()
         self.agent = None
 
+    def _load_terrain_bank(self):
+        self.terrain_bank = terrain_bank.TerrainBank(self.terrain_bank_path)
+        if self.terrain_bank.original_noise != self.original_noise or self.terrain_bank.difficulty != self.difficulty:
+            raise ValueError(f"Terrain bank {self.terrain_bank_path} was generated with original_noise="
+                             f"{self.terrain_bank.original_noise} and difficulty={self.terrain_bank.difficulty}, "
+                             f"but the env uses original_noise={self.original_noise} and "
+                             f"difficulty={self.difficulty}")
+
     def _generate_ground(self, seed: Optional[int] = None):
-        # Variables
-        ground_template = ground.Ground(original_noise=self.original_noise)  # Template to store the ground vectors
-        ground_template.randomize_ground(seed=seed)  # Randomizes the ground using the difficulty and perlin noise
+        if self.terrain_bank_path is not None and self.terrain_bank is None:
+            self._load_terrain_bank()
+        # Use the pre-generated (and already validated) terrain when the seed is in the terrain bank
+        if self.terrain_bank is not None and seed is not None and seed in self.terrain_bank:
+            self.ground = self.terrain_bank.load_ground(seed, world=self.world)
+            self.ground.setBodies(self.world, streaming=self.streaming_ground)
+            return
 
-        # Generate until we find ground that is not too steep
-        while ground_template.groundTooSteep():
-            ground_template = ground.Ground(original_noise=self.original_noise)
-            ground_template.randomize_ground(seed=seed)
+        # Without a seed the ground gets a seed from the random generator of the env, which is seeded by reset
+        if seed is None:
+            seed = int(self.np_random.integers(2 ** 31))
+        # Template to store the ground vectors, retries deterministic sub-seeds when the ground is too steep
+        ground_template = ground.generate_ground(seed, self.original_noise, self.difficulty)
+        if ground_template.rejected_ranges:  # Reported once per reset
+            ranges = ", ".join(f"{start:.1f}-{end:.1f}" for start, end in ground_template.rejected_ranges)
+            gym.logger.warn(f"Rejected {len(ground_template.rejected_ranges)} grounds for seed {seed} that were too "
+                            f"steep between x={ranges}")
 
         # Add the ground to the world
         self.ground = ground.Ground(self.world)
         self.ground.cloneFrom(ground_template)  # Copy the ground_template to self.ground
-        self.ground.setBodies(self.world)  # Add the bodies to the world
+        self.ground.setBodies(self.world, streaming=self.streaming_ground)  # Add the bodies to the world
+
+    def _reset_ground(self, seed: Optional[int] = None):
+        # Destroy world, the static ground bodies are kept when the ground of the same seed is requested again
+        reuse_ground = seed is not None and self.ground is not None and seed == self.ground_seed
+        self._destroy_world(keep_ground=reuse_ground)
+        # Generate new world. A new ground gets a new Box2D world, the order of the contacts (and so the simulation)
+        # depends on the broad-phase tree of the world, which would otherwise depend on the earlier episodes
+        if not reuse_ground:
+            self.world = b2World(gravity=(0, GRAVITY), doSleep=True)
+        self.world.contactListener = ContactListener()
+        if not reuse_ground:
+            self._generate_ground(seed=seed)
+            self.ground_seed = seed
 
     def _generate_agent(self):
-        self.agent = agent.Agent(real_world=self.world)
+        self.agent = agent.Agent(real_world=self.world, spawning_y=self.ground.spawning_y)
         self.agent.add_to_world()
-
-    # Function that executes an action based on the given action_space_type
-    def _execute_action(self, action):
+        self.ground.update_window(self.agent.car.pos_x)  # Add the ground around the spawn when streaming
+
+    # Advances the world by one frame (1 / FPS seconds), split into sub_steps equal world steps
+    def _step_world(self):
+        time_step = 1.0 / self.metadata["render_fps"] / self.sub_steps
+        for _ in range(self.sub_steps):
+            self.world.Step(timeStep=time_step, velocityIterations=self.velocity_iterations,
+                            positionIterations=self.position_iterations)
+
+    # Function that executes an action based on the given action_space_type, on our agent or the given agent
+    def _execute_action(self, action, target_agent: Optional['agent.Agent'] = None):
+        car = (target_agent or self.agent).car
         match self.action_space_type:  # Check which action space type we have
             case "discrete_3":
                 match action:
                     case 0:  # Idle
-                        self.agent.car.motor_off()
+                        car.motor_off()
                     case 1:  # Gas
-                        self.agent.car.motor_on(forward=True)
+                        car.motor_on(forward=True)
                     case 2:  # Reverse
-                        self.agent.car.motor_on(forward=False)
+                        car.motor_on(forward=False)
             case "continuous":  # Continuous motor wheel speeds
-                self.agent.car.set_motor_wheel_speed(action[0])
+                car.set_motor_wheel_speed(action[0])
 
     # Function that calculates the reward for a given timestep based on the reward_type
     def _get_reward(self, action):
@@ -278,27 +475,67 @@ class HillRacingEnv(gym.Env):
         return reward
 
     def _get_obs(self):
+        if self.observation_mode == "flat":
+            write_flat_observation(self._observation, self.agent, self.observation_extras, self.ground,
+                                   self.terrain_lookahead, self.terrain_lookahead_skip)
+            return self._observation.copy()
         return {
             "chassis_position": np.array(
                 [self.agent.car.pos_x, self.agent.car.pos_y], dtype=np.float32),
             "chassis_angle": np.array([(math.degrees(-self.agent.car.chassis_body.angle) % 360)], dtype=np.float32),
             "wheels_speed": np.array([self.agent.car.wheels[0].joint.speed, self.agent.car.wheels[1].joint.speed],
                                      dtype=np.float32),
-            "on_ground": np.array([int(self.agent.car.wheels[0].on_ground), int(self.agent.car.wheels[1].on_ground)])
+            "on_ground": np.array([self.agent.car.wheels[0].on_ground, self.agent.car.wheels[1].on_ground],
+                                  dtype=np.int8)
         }
 
+    def _get_info(self, terminated: bool, truncated: bool) -> dict:
+        info = {}
+        if self.info_level == "full":
+            info = {
+                "car_position": (self.agent.car.pos_x, self.agent.car.pos_y),
+                "prev_max_distance": self.agent.car.prev_max_distance,
+                "score": self.agent.score,
+                "dead": self.agent.car.dead,
+                "steps_stuck": self.step_stuck_counter,
+                "airtime_counter": self.agent.airtime_counter,
+                "total_airtime": self.total_airtime_counter,
+                "on_ground": (self.agent.car.wheels[0].on_ground, self.agent.car.wheels[1].on_ground)
+            }
+        if not terminated and not truncated:
+            return info
+        if self.info_level != "none":  # Stats of the episode that just ended, the full info gets them too
+            if self.agent.dead:
+                end_reason = "dead"
+            elif truncated:
+                end_reason = "stuck"
+            else:
+                end_reason = "max_score"
+            info.update({
+                "score": self.agent.score,
+                "total_airtime": self.total_airtime_counter,
+                "steps": self.step_counter,
+                "end_reason": end_reason
+            })
+        # The recorded trajectory is only delivered at the end of the episode, so the info has a constant size
+        if self.trajectory.mode != "off":
+            info["trajectory"] = self.trajectory.trajectory()
+        if self.state_recorder is not None:
+            info["state_recording"] = self.state_recorder.recording()
+        return info
+
     def reset(self, *, seed: Optional[int] = None, options: Optional[dict] = None):
         super().reset(seed=seed)
         info = {}
-        # Destroy world
-        self._destroy_world()
-        # Generate new world
-        self.world.contactListener = ContactListener()
-        self._generate_ground(seed=seed)
+        self._reset_ground(seed=seed)
         self._generate_agent()
         self.step_stuck_counter = 0  # Set step counter to 0
         self.step_counter = 0
-        self.position_list.clear()  # Empty list
+        self.previous_stuck_pos = None  # The stuck position of the previous episode does not count for this one
+        self.trajectory.reset()
+        if self.state_recorder is not None:
+            self.state_recorder.reset(self.ground, self.ground.seed)
+            self.state_recorder.record(self.agent)
         self.total_airtime_counter = 0
         # Get the initial observations
         observations = self._get_obs()
@@ -308,63 +545,98 @@ class HillRacingEnv(gym.Env):
 
         return observations, info
 
+    # Returns a snapshot of the simulation in a float64 array: the counters of the env and the bodies, joint motors and
+    # counters of the agent. The ground is not part of the snapshot, it is identified by its seed
+    def get_state(self) -> np.ndarray:
+        seed = int(self.ground.seed)
+        if not 0 <= seed <= MAX_STATE_SEED:
+            raise ValueError(f"State snapshots support ground seeds from 0 to {MAX_STATE_SEED}, got {seed}")
+        state = np.empty(len(ENV_STATE_FIELDS) + snapshot.AGENT_STATE_SIZE)
+        state[:len(ENV_STATE_FIELDS)] = (seed >> 32, seed & 0xFFFFFFFF, self.step_counter, self.step_stuck_counter,
+                                         np.nan if self.previous_stuck_pos is None else self.previous_stuck_pos,
+                                         self.total_airtime_counter)
+        snapshot.write_agent_state(state[len(ENV_STATE_FIELDS):], self.agent)
+        return state
+
+    # Restores a snapshot of get_state on the current ground and returns the observation. Only the agent is rebuilt,
+    # restoring is much cheaper than a reset and replaying the steps. Restores of the same snapshot continue the same
+    # way, the recorded trajectory and states continue from the current episode
+    def set_state(self, state: np.ndarray):
+        if state.shape != (len(ENV_STATE_FIELDS) + snapshot.AGENT_STATE_SIZE,):
+            raise ValueError(f"State snapshot should have shape {(len(ENV_STATE_FIELDS) + snapshot.AGENT_STATE_SIZE,)},"
+                             f" got {state.shape}")
+        seed_high, seed_low, step_counter, step_stuck_counter, previous_stuck_pos, total_airtime_counter = \
+            state[:len(ENV_STATE_FIELDS)].tolist()
+        ground_seed = (int(seed_high) << 32) | int(seed_low)
+        if ground_seed != self.ground.seed:
+            raise ValueError(f"State snapshot was taken on the ground of seed {ground_seed}, but the env has the "
+                             f"ground of seed {self.ground.seed}, reset with that seed first")
+        self.agent.destroy_agent()
+        self._generate_agent()
+        snapshot.restore_agent_state(self.agent, state[len(ENV_STATE_FIELDS):])
+        self.ground.update_window(self.agent.car.pos_x)
+        self.step_counter = int(step_counter)
+        self.step_stuck_counter = int(step_stuck_counter)
+        self.previous_stuck_pos = None if math.isnan(previous_stuck_pos) else int(previous_stuck_pos)
+        self.total_airtime_counter = int(total_airtime_counter)
+        return self._get_obs()
+
     def step(self, action: int | np.float32):
         terminated = False
         truncated = False
         reward = 0  # initial reward of -1, if the agent does completely nothing
 
-        # Execute action
-        self._execute_action(action)
-        # Step forward in the world
-        self.world.Step(timeStep=1.0 / self.metadata["render_fps"], velocityIterations=6 * 30,
-                        positionIterations=2 * 30)
-        # Increase step counter
-        self.step_stuck_counter += 1
-        self.step_counter += 1
-        # Increase airtime counter
-        if self.agent.total_airtime > 0:
-            self.total_airtime_counter += self.agent.total_airtime
-        # Update position
-        self.position_list.append((int(self.agent.car.pos_x), self.step_counter))
-        # Update agent status
-        self.agent.update()
-
-        # Check if agent is stuck
-        if (math.floor(self.agent.car.pos_x) % 20 == 0 and self.previous_stuck_pos !=
-                math.floor(self.agent.car.pos_x)):  # when we made more
-            # than 20 metres distance reset count, and we are not at the same position we were stuck in
-            self.step_stuck_counter = 0
-            self.previous_stuck_pos = math.floor(self.agent.car.pos_x)
-        else:  # When no significant distance has been made for a long time, the agent must be stuck
-            if self.step_stuck_counter > self.max_steps:
-                truncated = True
-                reward = -100
-
-        # If agent is dead
-        if self.agent.dead:
-            terminated = True
-            reward = -100
-        elif self.agent.score >= MAX_SCORE:  # If max score is achieved
-            terminated = True
-
-        # Reward shaping if agent is still alive or not stuck
-        if not truncated and not terminated:
-            reward = self._get_reward(action)
+        # Simulate action_repeat frames with the same action, the rewards of the frames are summed
+        for _ in range(self.action_repeat):
+            frame_reward = 0
+            # Execute action, every frame like separate steps would (Box2D clears the applied torque after a step)
+            self._execute_action(action)
+            # Step forward in the world
+            self._step_world()
+            # Increase step counter
+            self.step_stuck_counter += 1
+            self.step_counter += 1
+            # Increase airtime counter
+            if self.agent.total_airtime > 0:
+                self.total_airtime_counter += self.agent.total_airtime
+            # Update agent status
+            self.agent.update()
+            # Record position after the update, so the trajectory matches the car_position of the info
+            self.trajectory.record(self.step_counter, self.agent.car.pos_x, self.agent.car.pos_y)
+            if self.state_recorder is not None:
+                self.state_recorder.record(self.agent)
+            # Move the window of ground in the world along with the car when streaming
+            self.ground.update_window(self.agent.car.pos_x)
+
+            # Check if agent is stuck
+            if (math.floor(self.agent.car.pos_x) % 20 == 0 and self.previous_stuck_pos !=
+                    math.floor(self.agent.car.pos_x)):  # when we made more
+                # than 20 metres distance reset count, and we are not at the same position we were stuck in
+                self.step_stuck_counter = 0
+                self.previous_stuck_pos = math.floor(self.agent.car.pos_x)
+            else:  # When no significant distance has been made for a long time, the agent must be stuck
+                if self.step_stuck_counter > self.max_steps:
+                    truncated = True
+                    frame_reward = -100
+
+            # If agent is dead
+            if self.agent.dead:
+                terminated = True
+                frame_reward = -100
+            elif self.agent.score >= MAX_SCORE:  # If max score is achieved
+                terminated = True
+
+            # Reward shaping if agent is still alive or not stuck
+            if not truncated and not terminated:
+                frame_reward = self._get_reward(action)
+            reward += frame_reward
+            if terminated or truncated:  # Skip the remaining frames when the episode has ended
+                break
 
         # Get the current step observation and info for debugging
         observation = self._get_obs()
 
-        info = {
-            "car_position": (self.agent.car.pos_x, self.agent.car.pos_y),
-            "prev_max_distance": self.agent.car.prev_max_distance,
-            "score": self.agent.score,
-            "dead": self.agent.car.dead,
-            "steps_stuck": self.step_stuck_counter,
-            "airtime_counter": self.agent.airtime_counter,
-            "total_airtime": self.total_airtime_counter,
-            "on_ground": (self.agent.car.wheels[0].on_ground, self.agent.car.wheels[1].on_ground),
-            "position_list": self.position_list
-        }
+        info = self._get_info(terminated, truncated)
         # print(reward, info, observation, action)  # For debugging purposes
         return observation, reward, terminated, truncated, info
 
@@ -378,29 +650,40 @@ class HillRacingEnv(gym.Env):
             )
             return
 
-        if self.screen is None and self.render_mode == "human":
-            pygame.init()
-            pygame.display.init()
-            self.screen = pygame.display.set_mode(
-                (SCREEN_WIDTH, SCREEN_HEIGHT)
-            )
-            pygame.display.set_caption("Hill climb RL")
+        # Imported on the first render, so headless envs never load pygame
+        import pygame
+        from . import sprite_atlas
+        if self.sprite_atlas is None:
+            self.sprite_atlas = sprite_atlas.SpriteAtlas()
+        if self.screen is None:
+            if self.render_mode == "human":
+                pygame.init()
+                pygame.display.init()
+                self.screen = pygame.display.set_mode(
+                    (SCREEN_WIDTH, SCREEN_HEIGHT)
+                )
+                pygame.display.set_caption("Hill climb RL")
+            else:  # Off-screen surface that draws straight into a NumPy buffer, no display is needed (headless)
+                self._frame = np.zeros((SCREEN_HEIGHT, SCREEN_WIDTH, 4), dtype=np.uint8)
+                self.screen = pygame.image.frombuffer(self._frame, (SCREEN_WIDTH, SCREEN_HEIGHT), "RGBX")
         if self.clock is None and self.render_mode == "human":
             self.clock = pygame.time.Clock()
 
         assert self.screen is not None
-        assert self.clock is not None
-        # Fill screen with sky colour
-        self.screen.fill((135, 206, 235))
-        # Draw the ground to screen
-        self.ground.draw_ground(self.screen)
-        # Draw the agent
-        self.agent.draw_agent(self.screen)
+        draw_scene(self.screen, self.ground, self.agent, self.sprite_atlas)
+        if self.render_mode == "rgb_array":
+            # The surface shares its pixels with the buffer, copy the frame since the buffer is drawn over next call
+            return self._frame[:, :, :3].copy()
         # Update the screen
+        assert self.clock is not None
         pygame.display.flip()
         self.clock.tick(self.metadata["render_fps"])
 
     def close(self):
-        if self.screen is not None:
+        if self.screen is not None and self.render_mode == "human":
+            import pygame
             pygame.display.quit()
             pygame.quit()
+        self.screen = None
+        self._frame = None
+        self.clock = None
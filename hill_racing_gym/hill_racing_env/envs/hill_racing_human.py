@@ -10,8 +10,9 @@ from gymnasium import spaces
 from typing import Optional
 import numpy as np
 import math
-import ground
-import agent
+from . import ground
+from . import agent
+from . import sprite_atlas
 
 # CHANGE GAMEPLAY AND OTHER VARIABLES IN "hill.racing.py"
 # Fundamental constants (not recommended to change)
@@ -47,16 +48,16 @@ class ContactListener(b2ContactListener):
 
         # Check if we contact the wheel with the ground or vice versa.
         if contact.fixtureA.body.userData.id == "wheel" and contact.fixtureB.body.userData.id == "ground":
-            contact.fixtureA.body.userData.on_ground = True
+            contact.fixtureA.body.userData.add_ground_contact()
         if contact.fixtureB.body.userData.id == "wheel" and contact.fixtureA.body.userData.id == "ground":
-            contact.fixtureB.body.userData.on_ground = True
+            contact.fixtureB.body.userData.add_ground_contact()
 
     def EndContact(self, contact: b2Contact) -> None:
-        # End of contact, we need to set the on_ground variable on false
+        # End of contact, the wheel is no longer on the ground when this was its last contact with the ground
         if contact.fixtureA.body.userData.id == "wheel" and contact.fixtureB.body.userData.id == "ground":
-            contact.fixtureA.body.userData.on_ground = False
+            contact.fixtureA.body.userData.remove_ground_contact()
         if contact.fixtureB.body.userData.id == "wheel" and contact.fixtureA.body.userData.id == "ground":
-            contact.fixtureB.body.userData.on_ground = False
+            contact.fixtureB.body.userData.remove_ground_contact()
 
 
 # Key events handler when human is playing
@@ -124,13 +125,8 @@ def human_play():
 def setup_world() -> tuple['ground.Ground', 'agent.Agent', b2World]:
     # Variables
     main_world = b2World(contactListener=ContactListener(), gravity=b2Vec2(0, GRAVITY), doSleep=True)
-    ground_template = ground.Ground(original_noise=ORIGINAL_NOISE)  # Template to store the ground vectors
-    ground_template.randomize_ground()  # Randomizes the ground using the difficulty and perlin noise
-
-    # Generate until we find ground that is not too steep
-    while ground_template.groundTooSteep():
-        ground_template = ground.Ground()
-        ground_template.randomize_ground()
+    # Template to store the ground vectors, a new random ground every game that is not too steep
+    ground_template = ground.generate_ground(int(np.random.default_rng().integers(2 ** 31)), ORIGINAL_NOISE)
 
     # Set up the ground
     main_ground = ground.Ground(main_world)
@@ -138,7 +134,7 @@ def setup_world() -> tuple['ground.Ground', 'agent.Agent', b2World]:
     main_ground.setBodies(main_world)
 
     # Set up the world and agent
-    human_agent = agent.Agent(real_world=main_world)
+    human_agent = agent.Agent(real_world=main_world, spawning_y=main_ground.spawning_y)
     human_agent.add_to_world()
     return main_ground, human_agent, main_world
 
@@ -146,17 +142,19 @@ def setup_world() -> tuple['ground.Ground', 'agent.Agent', b2World]:
 def draw(render_ground, render_agent) -> None:
     screen.fill((135, 206, 235))
     # Draw the ground to screen
-    render_ground.draw_ground(screen)
+    render_ground.draw_ground(screen, render_agent.pan_x, render_agent.pan_y)
     # Draw the agent
-    render_agent.draw_agent(screen)
+    render_agent.draw_agent(screen, atlas)
     # Update the screen
     pygame.display.flip()
 
 
+# Play the game yourself with python -m hill_racing_env.envs.hill_racing_human
 if __name__ == "__main__":
     # Initialize Pygame
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Hill climb")
+    atlas = sprite_atlas.SpriteAtlas()
     clock = pygame.time.Clock()
     human_play()
@@ -0,0 +1,109 @@
+import numpy as np
+from gymnasium.vector import AutoresetMode
+from typing import Optional, Sequence
+from . import hill_racing
+from . import agent
+from .hill_racing_vector import HillRacingVectorEnv
+
+
+# Races K cars on one shared ground in a single Box2D world, the ground is built once and the world is stepped once
+# for all K policies. Cars do not collide with each other, they share the negative CAR_GROUP collision group.
+# By default finished agents leave the world and wait until reset (like a generation of a population), with next-step
+# or same-step autoreset a finished agent is respawned on the same ground without tearing down the world.
+class HillRacingMultiAgentEnv(HillRacingVectorEnv):
+    metadata = {
+        "render_modes": [],
+        "render_fps": hill_racing.FPS,
+        "autoreset_mode": AutoresetMode.DISABLED
+    }
+
+    def __init__(
+            self,
+            num_agents: int,
+            action_space: str = "discrete_3",
+            reward_function: str = "distance",
+            reward_type: str = "aggressive",
+            max_steps: int = hill_racing.FPS * 20,
+            original_noise: bool = False,
+            terrain_bank: Optional[str] = None,
+            streaming_ground: bool = False,
+            difficulty: int = hill_racing.DIFFICULTY,
+            physics_profile: str = "accurate",
+            physics_config: Optional[dict] = None,
+            action_repeat: Optional[int] = None,
+            observation_extras: Sequence[str] = (),
+            terrain_lookahead: int = 10,
+            terrain_lookahead_skip: int = 1,
+            autoreset_mode: AutoresetMode = AutoresetMode.DISABLED
+    ):
+        self.env: Optional[hill_racing.HillRacingEnv] = None  # Owns the shared world and ground
+        self.agents: list[Optional['agent.Agent']] = [None] * num_agents
+        super().__init__(num_agents, action_space=action_space, reward_function=reward_function,
+                         reward_type=reward_type, max_steps=max_steps, original_noise=original_noise,
+                         terrain_bank=terrain_bank, streaming_ground=streaming_ground, difficulty=difficulty,
+                         physics_profile=physics_profile, physics_config=physics_config, action_repeat=action_repeat,
+                         observation_extras=observation_extras, terrain_lookahead=terrain_lookahead,
+                         terrain_lookahead_skip=terrain_lookahead_skip, autoreset_mode=autoreset_mode)
+
+    def _create_envs(self, env_kwargs: dict):
+        self.env = hill_racing.HillRacingEnv(**env_kwargs)
+        self.envs = [self.env]
+
+    def _agent(self, i: int):
+        return self.agents[i]
+
+    def _ground(self, i: int):
+        return self.env.ground
+
+    # Removes the car of agent i from the world, the world and other cars are untouched
+    def _remove_agent(self, i: int):
+        if self.agents[i] is not None:
+            self.agents[i].destroy_agent()
+            self.agents[i] = None
+
+    # Moves the window of streamed ground along with all cars in the world
+    def _update_ground_window(self):
+        self.env.ground.update_window(*[racer.car.pos_x for racer in self.agents if racer is not None])
+
+    # Respawns the car of agent i at the spawn location of the shared ground
+    def _reset_env(self, i: int, seed: Optional[int] = None):
+        self._remove_agent(i)
+        self.agents[i] = agent.Agent(real_world=self.env.world, spawning_y=self.env.ground.spawning_y)
+        self.agents[i].add_to_world()
+        self._update_ground_window()
+        self._reset_counters(i)
+        self._read_state(i)
+
+    def reset(self, *, seed: Optional[int] = None, options: Optional[dict] = None):
+        # Only respawn the given agents on the current ground, before the first reset there is no ground yet and the
+        # mask is ignored
+        if options is not None and "reset_mask" in options and self.env.ground is not None:
+            reset_mask = np.asarray(options["reset_mask"], dtype=np.bool_)
+        else:  # Generate (or reuse for the same seed) the shared ground and respawn all agents
+            reset_mask = np.ones(self.num_envs, dtype=np.bool_)
+            for i in range(self.num_envs):
+                self._remove_agent(i)
+            self.env._reset_ground(seed=seed)
+
+        for i in np.flatnonzero(reset_mask):
+            self._reset_env(i)
+        self._autoreset[reset_mask] = False
+        return self._observations.copy(), {}
+
+    def _step_agents(self, actions: np.ndarray, stepped: np.ndarray, pending_reset: np.ndarray):
+        for i in np.flatnonzero(stepped):
+            self.env._execute_action(actions[i], self.agents[i])
+        # One physics step for all cars in the shared world
+        if stepped.any():
+            self.env._step_world()
+        for i in np.flatnonzero(stepped):
+            self._update_agent(i)
+            self._read_state(i)
+        # Respawn after the physics step, so the returned observation is the state at spawn
+        for i in np.flatnonzero(pending_reset):
+            self._reset_env(i)
+        self._update_ground_window()
+
+    # Finished cars leave the world right away, so they do not keep being simulated
+    def _end_episode(self, i: int):
+        self._remove_agent(i)
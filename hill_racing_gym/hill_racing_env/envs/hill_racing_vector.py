@@ -0,0 +1,251 @@
+import gymnasium as gym
+import numpy as np
+from gymnasium import spaces
+from gymnasium.vector import AutoresetMode
+from gymnasium.vector.utils import batch_space
+from typing import Optional, Sequence
+from . import hill_racing
+
+
+# Steps N hill racing cars in one process and returns stacked observations, rewards and flags as arrays.
+# Every sub-environment keeps its own Box2D world and ground, which are built by HillRacingEnv, but the step logic,
+# observations and rewards are done for all cars at once.
+class HillRacingVectorEnv(gym.vector.VectorEnv):
+    metadata = {
+        "render_modes": [],
+        "render_fps": hill_racing.FPS,
+        "autoreset_mode": AutoresetMode.NEXT_STEP
+    }
+
+    def __init__(
+            self,
+            num_envs: int,
+            action_space: str = "discrete_3",
+            reward_function: str = "distance",
+            reward_type: str = "aggressive",
+            max_steps: int = hill_racing.FPS * 20,
+            original_noise: bool = False,
+            terrain_bank: Optional[str] = None,
+            streaming_ground: bool = False,
+            difficulty: int = hill_racing.DIFFICULTY,
+            physics_profile: str = "accurate",
+            physics_config: Optional[dict] = None,
+            action_repeat: Optional[int] = None,
+            observation_extras: Sequence[str] = (),
+            terrain_lookahead: int = 10,
+            terrain_lookahead_skip: int = 1,
+            autoreset_mode: AutoresetMode = AutoresetMode.NEXT_STEP
+    ):
+        self.num_envs = num_envs
+        self.envs: list[hill_racing.HillRacingEnv] = []
+        self._create_envs(dict(action_space=action_space, reward_function=reward_function, reward_type=reward_type,
+                               max_steps=max_steps, original_noise=original_noise, terrain_bank=terrain_bank,
+                               streaming_ground=streaming_ground, difficulty=difficulty,
+                               physics_profile=physics_profile, physics_config=physics_config,
+                               action_repeat=action_repeat, observation_mode="flat"))
+        self.action_repeat = self.envs[0].action_repeat
+        self.action_space_type = action_space
+        self.reward_function = reward_function
+        self.reward_type = reward_type
+        self.max_steps = max_steps
+        self.autoreset_mode = AutoresetMode(autoreset_mode)
+        self.metadata = dict(self.metadata, autoreset_mode=self.autoreset_mode)
+        self.render_mode = None
+
+        self.single_action_space = self.envs[0].action_space
+        self.action_space = batch_space(self.single_action_space, num_envs)
+        # Every row is a flat observation of HillRacingEnv(observation_mode="flat")
+        self.observation_extras = tuple(observation_extras)
+        self.terrain_lookahead = terrain_lookahead
+        self.terrain_lookahead_skip = terrain_lookahead_skip
+        low, high = hill_racing.flat_observation_bounds(self.observation_extras, terrain_lookahead)
+        self.single_observation_space = spaces.Box(low=low, high=high, dtype=np.float32)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+
+        # Preallocated buffers for the state of all cars
+        self._observations = np.zeros((num_envs, len(low)), dtype=np.float32)
+        self._pos_x = np.zeros(num_envs, dtype=np.float64)
+        self._prev_max_distance = np.zeros(num_envs, dtype=np.float64)
+        self._wheel_speeds = np.zeros((num_envs, 2), dtype=np.float64)
+        self._airtime_counter = np.zeros(num_envs, dtype=np.int64)
+        self._score = np.zeros(num_envs, dtype=np.int64)
+        self._dead = np.zeros(num_envs, dtype=np.bool_)
+        self._step_stuck_counter = np.zeros(num_envs, dtype=np.int64)
+        self._step_counter = np.zeros(num_envs, dtype=np.int64)
+        self._total_airtime_counter = np.zeros(num_envs, dtype=np.int64)
+        self._previous_stuck_pos = np.full(num_envs, np.nan)
+        self._autoreset = np.zeros(num_envs, dtype=np.bool_)
+
+        # Rewards for idling and reversing depend on the reward type
+        self._idle_reward = 0.0
+        self._reverse_reward = 0.0
+        if reward_type == "aggressive":
+            self._idle_reward = -0.5
+            self._reverse_reward = -1.0
+        elif reward_type == "soft":
+            self._idle_reward = -0.1
+            self._reverse_reward = -0.2
+
+    # Creates the HillRacingEnv instances that own the Box2D worlds and ground, one for every sub-environment
+    def _create_envs(self, env_kwargs: dict):
+        self.envs = [hill_racing.HillRacingEnv(**env_kwargs) for _ in range(self.num_envs)]
+
+    # Returns the agent of sub-environment i
+    def _agent(self, i: int):
+        return self.envs[i].agent
+
+    # Returns the ground agent i drives on
+    def _ground(self, i: int):
+        return self.envs[i].ground
+
+    # Reads the state of car i into the buffers and writes its observation
+    def _read_state(self, i: int):
+        agent = self._agent(i)
+        car = agent.car
+        hill_racing.write_flat_observation(self._observations[i], agent, self.observation_extras, self._ground(i),
+                                           self.terrain_lookahead, self.terrain_lookahead_skip)
+        self._wheel_speeds[i, 0] = car.wheels[0].joint.speed
+        self._wheel_speeds[i, 1] = car.wheels[1].joint.speed
+        self._pos_x[i] = car.pos_x
+        self._prev_max_distance[i] = car.prev_max_distance
+        self._airtime_counter[i] = agent.airtime_counter
+        self._score[i] = agent.score
+        self._dead[i] = agent.dead
+
+    # Updates the counters and status of agent i after a physics step
+    def _update_agent(self, i: int):
+        agent = self._agent(i)
+        self._step_counter[i] += 1
+        if agent.total_airtime > 0:
+            self._total_airtime_counter[i] += agent.total_airtime
+        agent.update()
+
+    def _reset_counters(self, i: int):
+        self._step_stuck_counter[i] = 0
+        self._step_counter[i] = 0
+        self._previous_stuck_pos[i] = np.nan
+        self._total_airtime_counter[i] = 0
+
+    def _reset_env(self, i: int, seed: Optional[int] = None):
+        self.envs[i].reset(seed=seed)
+        self._reset_counters(i)
+        self._read_state(i)
+
+    # Turns the seed argument of reset into one seed per sub-environment
+    def _seeds(self, seed: Optional[int | list[int]]) -> list[Optional[int]]:
+        if seed is None or isinstance(seed, int):
+            return [None if seed is None else seed + i for i in range(self.num_envs)]
+        assert len(seed) == self.num_envs, "Expected one seed for every sub-environment"
+        return list(seed)
+
+    def reset(self, *, seed: Optional[int | list[int]] = None, options: Optional[dict] = None):
+        seeds = self._seeds(seed)
+        reset_mask = np.ones(self.num_envs, dtype=np.bool_)
+        if options is not None and "reset_mask" in options:
+            reset_mask = np.asarray(options["reset_mask"], dtype=np.bool_)
+
+        for i in np.flatnonzero(reset_mask):
+            self._reset_env(i, seeds[i])
+        self._autoreset[reset_mask] = False
+        return self._observations.copy(), {}
+
+    # Computes the rewards of all cars at once, same as HillRacingEnv._get_reward
+    def _get_rewards(self, actions: np.ndarray) -> np.ndarray:
+        idle = self._idle_reward
+        reverse = self._reverse_reward
+        distance_gain = self._pos_x - self._prev_max_distance
+        speeds = self._wheel_speeds
+        match self.reward_function:
+            case "distance" | "airtime_distance":
+                rewards = np.where(distance_gain < 0, reverse + distance_gain,
+                                   np.where(distance_gain < 0.001, idle, 1 + distance_gain))
+            case "action":
+                actions = actions.reshape(self.num_envs, -1)[:, 0]
+                rewards = np.select([actions == 0, actions == 1, actions == 2], [idle, 1.0, reverse], default=0.0)
+            case "wheel_speed" | "airtime_wheel_speed":
+                rewards = np.select(
+                    [np.all((-1 <= speeds) & (speeds <= 1), axis=1), np.all(speeds < 0, axis=1),
+                     np.all(speeds > 0, axis=1)],
+                    [idle, 1.0, reverse], default=0.0)
+            case _:
+                raise ValueError(f"Unknown reward function {self.reward_function}")
+        if self.reward_function.startswith("airtime"):
+            rewards = np.where(self._airtime_counter > 0, rewards + self._airtime_counter, rewards - 0.5)
+        return rewards
+
+    # Executes the actions and steps the physics of the stepped agents, resets the agents in pending_reset
+    def _step_agents(self, actions: np.ndarray, stepped: np.ndarray, pending_reset: np.ndarray):
+        for i, env in enumerate(self.envs):
+            if pending_reset[i]:  # Episode ended last step, reset instead of stepping (next-step autoreset)
+                self._reset_env(i)
+            if not stepped[i]:
+                continue
+            env._execute_action(actions[i])
+            env._step_world()
+            self._update_agent(i)
+            env.ground.update_window(env.agent.car.pos_x)
+            self._read_state(i)
+
+    # Called for every agent whose episode ended in this step
+    def _end_episode(self, i: int):
+        pass
+
+    def step(self, actions):
+        actions = np.asarray(actions)
+        rewards = np.zeros(self.num_envs, dtype=np.float64)
+        terminated = np.zeros(self.num_envs, dtype=np.bool_)
+        truncated = np.zeros(self.num_envs, dtype=np.bool_)
+        # Finished agents are not stepped, with next-step autoreset they are reset in this step instead
+        stepped = ~self._autoreset
+        pending_reset = self._autoreset & (self.autoreset_mode == AutoresetMode.NEXT_STEP)
+        # Simulate action_repeat frames with the same actions, agents whose episode ended skip the remaining frames
+        running = stepped.copy()
+        for frame in range(self.action_repeat):
+            self._step_agents(actions, running, pending_reset if frame == 0 else np.zeros_like(pending_reset))
+            self._step_stuck_counter[running] += 1
+
+            # Check if agents are stuck, when we made 20 metres distance (and are not at the same position) we reset
+            floor_pos_x = np.floor(self._pos_x)
+            progressed = running & (floor_pos_x % 20 == 0) & (self._previous_stuck_pos != floor_pos_x)
+            self._step_stuck_counter[progressed] = 0
+            self._previous_stuck_pos[progressed] = floor_pos_x[progressed]
+            frame_truncated = running & ~progressed & (self._step_stuck_counter > self.max_steps)
+            # Agents that died or achieved the max score are terminated
+            frame_terminated = running & (self._dead | (self._score >= hill_racing.MAX_SCORE))
+
+            # Reward shaping if agent is still alive or not stuck, -100 if the agent died or got stuck
+            frame_running = running & ~frame_terminated & ~frame_truncated
+            rewards[frame_running] += self._get_rewards(actions)[frame_running]
+            rewards[frame_truncated | (running & self._dead)] -= 100
+            terminated |= frame_terminated
+            truncated |= frame_truncated
+            running = frame_running
+            if not running.any():
+                break
+        self._autoreset[pending_reset] = False
+
+        infos = {}
+        done = terminated | truncated
+        if done.any():
+            infos["score"] = self._score.copy()
+            infos["_score"] = done
+            for i in np.flatnonzero(done):
+                self._end_episode(i)
+        observations = self._observations.copy()
+        match self.autoreset_mode:
+            case AutoresetMode.NEXT_STEP | AutoresetMode.DISABLED:
+                self._autoreset[done] = True  # Without autoreset finished agents wait for reset with a reset_mask
+            case AutoresetMode.SAME_STEP:
+                # The observations and infos of the finished episodes are moved to final_obs and final_info, the
+                # returned observations are the ones after the reset
+                if done.any():
+                    infos = {"final_obs": observations.copy(), "_final_obs": done,
+                             "final_info": infos, "_final_info": done}
+                    for i in np.flatnonzero(done):
+                        self._reset_env(i)
+                    observations = self._observations.copy()
+        return observations, rewards, terminated, truncated, infos
+
+    def close_extras(self, **kwargs):
+        for env in self.envs:
+            env.close()
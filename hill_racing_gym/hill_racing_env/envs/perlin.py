@@ -1,5 +1,6 @@
 import math
 import random
+import numpy as np
 
 PERLIN_YWRAPB = 4
 PERLIN_YWRAP = 1 << PERLIN_YWRAPB
@@ -15,11 +16,19 @@ def scaled_cosine(i):
     return 0.5 * (1.0 - math.cos(i * math.pi))
 
 
-perlin = [random.random() for _ in range(PERLIN_SIZE + 1)]
+# Random values the original noise interpolates between, drawn from the given random generator
+def perlin_table(rng: random.Random) -> np.ndarray:
+    return np.array([rng.random() for _ in range(PERLIN_SIZE + 1)])
+
+
+# Default table of original_pnoise, seeded so it is the same in every process
+perlin = perlin_table(random.Random(0)).tolist()
 
 
 # PERLIN NOISE PORTED FROM PROCESSING: https://processingfoundation.org/
-def original_pnoise(x, y=0, z=0):
+def original_pnoise(x, y=0, z=0, table=None):
+    if table is None:
+        table = perlin
     if x < 0:
         x = -x
     if y < 0:
@@ -42,17 +51,17 @@ def original_pnoise(x, y=0, z=0):
         rxf = scaled_cosine(xf)
         ryf = scaled_cosine(yf)
 
-        n1 = perlin[of & PERLIN_SIZE]
-        n1 += rxf * (perlin[(of + 1) & PERLIN_SIZE] - n1)
-        n2 = perlin[(of + PERLIN_YWRAP) & PERLIN_SIZE]
-        n2 += rxf * (perlin[(of + PERLIN_YWRAP + 1) & PERLIN_SIZE] - n2)
+        n1 = table[of & PERLIN_SIZE]
+        n1 += rxf * (table[(of + 1) & PERLIN_SIZE] - n1)
+        n2 = table[(of + PERLIN_YWRAP) & PERLIN_SIZE]
+        n2 += rxf * (table[(of + PERLIN_YWRAP + 1) & PERLIN_SIZE] - n2)
         n1 += ryf * (n2 - n1)
 
         of += PERLIN_ZWRAP
-        n2 = perlin[of & PERLIN_SIZE]
-        n2 += rxf * (perlin[(of + 1) & PERLIN_SIZE] - n2)
-        n3 = perlin[(of + PERLIN_YWRAP) & PERLIN_SIZE]
-        n3 += rxf * (perlin[(of + PERLIN_YWRAP + 1) & PERLIN_SIZE] - n3)
+        n2 = table[of & PERLIN_SIZE]
+        n2 += rxf * (table[(of + 1) & PERLIN_SIZE] - n2)
+        n3 = table[(of + PERLIN_YWRAP) & PERLIN_SIZE]
+        n3 += rxf * (table[(of + PERLIN_YWRAP + 1) & PERLIN_SIZE] - n3)
         n2 += ryf * (n3 - n2)
 
         n1 += scaled_cosine(zf) * (n2 - n1)
@@ -77,3 +86,91 @@ def original_pnoise(x, y=0, z=0):
             zf -= 1
 
     return r
+
+
+# Array version of original_pnoise(x) (y = z = 0) with the given table, returns float64 values identical to the scalar
+# version. With y = z = 0 the interpolation along y and z adds exactly zero, so only the x interpolation is left.
+def original_pnoise1_array(x, table: np.ndarray) -> np.ndarray:
+    x = np.abs(np.asarray(x, dtype=np.float64))
+    xi = np.floor(x).astype(np.int64)
+    xf = x - xi
+    r = np.zeros_like(x)
+    ampl = 0.5
+    for _ in range(perlin_octaves):
+        rxf = 0.5 * (1.0 - np.cos(xf * math.pi))  # scaled_cosine of every x at once
+        n1 = table[xi & PERLIN_SIZE]
+        n1 += rxf * (table[(xi + 1) & PERLIN_SIZE] - n1)
+        r += n1 * ampl
+        ampl *= perlin_amp_falloff
+        xi <<= 1
+        xf *= 2
+        wrapped = xf >= 1.0
+        xi[wrapped] += 1
+        xf[wrapped] -= 1
+    return r
+
+
+# IMPROVED PERLIN NOISE PORTED FROM THE "noise" PACKAGE (_perlin.c): https://github.com/caseman/noise
+# Evaluates noise.pnoise1 for a whole array at once, using the same float32 arithmetic so results are bit-identical.
+NOISE_PERM = np.tile(np.array([
+    151, 160, 137, 91, 90, 15, 131, 13, 201, 95, 96, 53, 194, 233, 7, 225,
+    140, 36, 103, 30, 69, 142, 8, 99, 37, 240, 21, 10, 23, 190, 6, 148,
+    247, 120, 234, 75, 0, 26, 197, 62, 94, 252, 219, 203, 117, 35, 11, 32,
+    57, 177, 33, 88, 237, 149, 56, 87, 174, 20, 125, 136, 171, 168, 68, 175,
+    74, 165, 71, 134, 139, 48, 27, 166, 77, 146, 158, 231, 83, 111, 229, 122,
+    60, 211, 133, 230, 220, 105, 92, 41, 55, 46, 245, 40, 244, 102, 143, 54,
+    65, 25, 63, 161, 1, 216, 80, 73, 209, 76, 132, 187, 208, 89, 18, 169,
+    200, 196, 135, 130, 116, 188, 159, 86, 164, 100, 109, 198, 173, 186, 3, 64,
+    52, 217, 226, 250, 124, 123, 5, 202, 38, 147, 118, 126, 255, 82, 85, 212,
+    207, 206, 59, 227, 47, 16, 58, 17, 182, 189, 28, 42, 223, 183, 170, 213,
+    119, 248, 152, 2, 44, 154, 163, 70, 221, 153, 101, 155, 167, 43, 172, 9,
+    129, 22, 39, 253, 19, 98, 108, 110, 79, 113, 224, 232, 178, 185, 112, 104,
+    218, 246, 97, 228, 251, 34, 242, 193, 238, 210, 144, 12, 191, 179, 162, 241,
+    81, 51, 145, 235, 249, 14, 239, 107, 49, 192, 214, 31, 181, 199, 106, 157,
+    184, 84, 204, 176, 115, 121, 50, 45, 127, 4, 150, 254, 138, 236, 205, 93,
+    222, 114, 67, 29, 24, 72, 243, 141, 128, 195, 78, 66, 215, 61, 156, 180,
+], dtype=np.int32), 2)
+
+
+def _lerp(t, a, b):
+    return a + t * (b - a)
+
+
+def _grad1(hash_values: np.ndarray, x: np.ndarray) -> np.ndarray:
+    g = ((hash_values & 7) + 1).astype(np.float32)
+    g[(hash_values & 8) != 0] = -1  # Same as the C implementation, which sets g to -1 instead of -g
+    return g * x
+
+
+def _noise1_array(x: np.ndarray, repeat: int, base: int) -> np.ndarray:
+    floor_x = np.floor(x)
+    i = np.fmod(floor_x.astype(np.int32), repeat)  # C modulo truncates towards zero
+    ii = np.fmod(i + 1, repeat)
+    i = (i & 255) + base
+    ii = (ii & 255) + base
+
+    x = x - floor_x
+    fx = x * x * x * (x * (x * 6 - 15) + 10)
+
+    return _lerp(fx, _grad1(NOISE_PERM[i], x), _grad1(NOISE_PERM[ii], x - 1)) * np.float32(0.4)
+
+
+# Array version of noise.pnoise1(x, octaves, persistence, lacunarity, repeat, base), returns float32 values
+def pnoise1_array(x, octaves: int = 1, persistence: float = 0.5, lacunarity: float = 2.0, repeat: int = 1024,
+                  base: int = 0) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float32)
+    if octaves == 1:
+        return _noise1_array(x, repeat, base)
+    elif octaves < 1:
+        raise ValueError("Expected octaves value > 0")
+
+    freq = np.float32(1)
+    amp = np.float32(1)
+    max_amp = np.float32(0)
+    total = np.zeros_like(x)
+    for _ in range(octaves):
+        total += _noise1_array(x * freq, int(repeat * freq), base) * amp
+        max_amp += amp
+        freq *= np.float32(lacunarity)
+        amp *= np.float32(persistence)
+    return total / max_amp
@@ -1,7 +1,10 @@
 import math
 from Box2D import *
-import pygame
-import hill_racing
+from . import hill_racing
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from . import sprite_atlas
 
 
 class Person:
@@ -33,15 +36,15 @@ class Person:
         self.dist_joint_head_torso = self.world.CreateJoint(dist_joint_def)
 
     # Function to render/draw the head and torso
-    def draw_person(self, surface_screen):
-        self.head.draw_head(surface_screen)
-        self.torso.draw_torso(surface_screen)
+    def draw_person(self, surface_screen, atlas: 'sprite_atlas.SpriteAtlas', pan_x: float = 0, pan_y: float = 0):
+        self.head.draw_head(surface_screen, atlas, pan_x, pan_y)
+        self.torso.draw_torso(surface_screen, atlas, pan_x, pan_y)
 
 
 class Head:
     def __init__(self, x, y, r, world=None):
         self.world = world
-        self.starting_position = pygame.Vector2(x, y)
+        self.starting_position = hill_racing.Position(x, y)
         self.radius = r
         self.body = None
         self.id = "head"
@@ -59,6 +62,7 @@ class Head:
         fix_def = b2FixtureDef(
             categoryBits=hill_racing.PERSON_CATEGORY,
             maskBits=hill_racing.PERSON_MASK,
+            groupIndex=hill_racing.CAR_GROUP,
             density=0.001,
             friction=0.01,
             restitution=0.01,
@@ -69,20 +73,16 @@ class Head:
         self.body.CreateFixture(fix_def)
 
     # Function that draws the head
-    def draw_head(self, surface_screen):
+    def draw_head(self, surface_screen, atlas: 'sprite_atlas.SpriteAtlas', pan_x: float = 0, pan_y: float = 0):
         pos_x = self.body.position.x * hill_racing.SCALE
         pos_y = self.body.position.y * hill_racing.SCALE
         degrees_angle = math.degrees(-self.body.angle) % 360
-        # Scale head sprite
-        hill_racing.head_sprite = pygame.transform.scale(
-            hill_racing.head_sprite, (hill_racing.WHEEL_SIZE, hill_racing.WHEEL_SIZE)
-        )
-        # Get angle and rotate head
-        rotated_head_sprite = pygame.transform.rotate(hill_racing.head_sprite, degrees_angle)
+        # Get the scaled head sprite rotated by body angle
+        rotated_head_sprite = atlas.rotated("head", (hill_racing.WHEEL_SIZE, hill_racing.WHEEL_SIZE), degrees_angle)
         # Update the head on screen position
         surface_screen.blit(
             source=rotated_head_sprite,
-            dest=(pos_x - hill_racing.panX - self.radius + 12, pos_y - hill_racing.panY - self.radius + 18)
+            dest=(pos_x - pan_x - self.radius + 12, pos_y - pan_y - self.radius + 18)
         )
 
 
@@ -92,7 +92,7 @@ class Torso:
         self.world = world
         self.width = width
         self.height = height
-        self.starting_position = pygame.Vector2(center_x, center_y)
+        self.starting_position = hill_racing.Position(center_x, center_y)
         self.body = None
         self.make_torso_body()
 
@@ -107,6 +107,7 @@ class Torso:
         fix_def = b2FixtureDef(
             categoryBits=hill_racing.PERSON_CATEGORY,
             maskBits=hill_racing.PERSON_MASK,
+            groupIndex=hill_racing.CAR_GROUP,
             density=0.002,
             friction=0.01,
             restitution=0.01,
@@ -119,18 +120,15 @@ class Torso:
         self.body.CreateFixture(fix_def)
 
     # Function that draws the torso to the screen
-    def draw_torso(self, surface_screen):
+    def draw_torso(self, surface_screen, atlas: 'sprite_atlas.SpriteAtlas', pan_x: float = 0, pan_y: float = 0):
         pos_x = self.body.position.x * hill_racing.SCALE
         pos_y = self.body.position.y * hill_racing.SCALE
         degrees_angle = math.degrees(self.body.angle) * -1
-
-        hill_racing.torso_sprite = pygame.transform.scale(
-            hill_racing.torso_sprite, (hill_racing.PERSON_WIDTH, hill_racing.PERSON_HEIGHT)
-        )
-        # Get angle and rotate head
-        rotated_torso_sprite = pygame.transform.rotate(hill_racing.torso_sprite, degrees_angle)
+        # Get the scaled torso sprite rotated by body angle
+        rotated_torso_sprite = atlas.rotated("torso", (hill_racing.PERSON_WIDTH, hill_racing.PERSON_HEIGHT),
+                                             degrees_angle)
         # Update the head on screen position
         surface_screen.blit(
             source=rotated_torso_sprite,
-            dest=(pos_x - hill_racing.panX, pos_y - hill_racing.panY)
+            dest=(pos_x - pan_x, pos_y - pan_y)
         )
@@ -0,0 +1,75 @@
+import numpy as np
+from . import agent
+
+# Bodies of the car whose state is captured, in order
+SNAPSHOT_BODIES = ["chassis", "back_wheel", "back_rim", "front_wheel", "front_rim", "head", "torso"]
+# Every body has a position x, y (meters), angle (radians), linear velocity x, y (m/s), angular velocity (rad/s) and
+# whether it is awake
+BODY_COLUMNS = 7
+# Motor of a wheel joint: enabled, speed (rad/s) and maximum torque, followed by whether the wheel is on the ground
+WHEEL_COLUMNS = 4
+# Counters of the agent and car that follow the bodies and wheels, in order
+AGENT_FIELDS = ["dead", "score", "pan_x", "pan_y", "steps_in_air", "airtime_counter", "total_airtime",
+                "car_dead", "pos_x", "pos_y", "max_distance", "prev_max_distance", "prev_pos_y", "motor_state"]
+AGENT_STATE_SIZE = BODY_COLUMNS * len(SNAPSHOT_BODIES) + WHEEL_COLUMNS * 2 + len(AGENT_FIELDS)
+
+
+# Returns the Box2D bodies of an agent in the order of SNAPSHOT_BODIES
+def snapshot_bodies(racer: 'agent.Agent') -> list:
+    car = racer.car
+    back_wheel, front_wheel = car.wheels
+    return [car.chassis_body, back_wheel.body, back_wheel.rim_body, front_wheel.body, front_wheel.rim_body,
+            car.person.head.body, car.person.torso.body]
+
+
+# Writes the state of an agent into the float64 buffer out of AGENT_STATE_SIZE values. Box2D stores floats in float32
+# and the counters are Python floats and ints, so every value is stored exactly
+def write_agent_state(out: np.ndarray, racer: 'agent.Agent'):
+    i = 0
+    for body in snapshot_bodies(racer):
+        position = body.position
+        velocity = body.linearVelocity
+        out[i:i + BODY_COLUMNS] = (position.x, position.y, body.angle, velocity.x, velocity.y, body.angularVelocity,
+                                   body.awake)
+        i += BODY_COLUMNS
+    car = racer.car
+    for wheel in car.wheels:
+        joint = wheel.joint
+        out[i:i + WHEEL_COLUMNS] = (joint.motorEnabled, joint.motorSpeed, joint.GetMaxMotorTorque(),
+                                   wheel.on_ground)
+        i += WHEEL_COLUMNS
+    out[i:] = (racer.dead, racer.score, racer.pan_x, racer.pan_y, racer.steps_in_air, racer.airtime_counter,
+               racer.total_airtime, car.dead, car.pos_x, car.pos_y, car.max_distance, car.prev_max_distance,
+               car.prev_pos_y, car.motor_state)
+
+
+# Moves the bodies of an agent to a state written by write_agent_state and restores its counters. The agent should be
+# freshly added to the world: Box2D does not expose the contacts and their cached impulses, new bodies start without
+# them, so every restore of the same state continues the same way
+def restore_agent_state(racer: 'agent.Agent', state: np.ndarray):
+    values = state.tolist()  # Box2D only accepts Python floats
+    i = 0
+    for body in snapshot_bodies(racer):
+        x, y, angle, velocity_x, velocity_y, angular_velocity, awake = values[i:i + BODY_COLUMNS]
+        body.transform = ((x, y), angle)
+        body.linearVelocity = (velocity_x, velocity_y)
+        body.angularVelocity = angular_velocity
+        body.awake = bool(awake)
+        i += BODY_COLUMNS
+    car = racer.car
+    for wheel in car.wheels:
+        motor_enabled, motor_speed, max_motor_torque, on_ground = values[i:i + WHEEL_COLUMNS]
+        wheel.joint.motorEnabled = bool(motor_enabled)
+        wheel.joint.motorSpeed = motor_speed
+        wheel.joint.maxMotorTorque = max_motor_torque
+        wheel.on_ground = bool(on_ground)
+        i += WHEEL_COLUMNS
+    (dead, score, racer.pan_x, racer.pan_y, steps_in_air, airtime_counter, total_airtime, car_dead, car.pos_x,
+     car.pos_y, car.max_distance, car.prev_max_distance, car.prev_pos_y, motor_state) = values[i:]
+    racer.dead = bool(dead)
+    racer.score = int(score)
+    racer.steps_in_air = int(steps_in_air)
+    racer.airtime_counter = int(airtime_counter)
+    racer.total_airtime = int(total_airtime)
+    car.dead = bool(car_dead)
+    car.motor_state = int(motor_state)
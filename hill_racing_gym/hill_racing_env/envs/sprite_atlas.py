@@ -0,0 +1,55 @@
+import os
+from collections import OrderedDict
+from functools import lru_cache
+import pygame
+
+# Sprite images in the pictures directory next to this module, found from any working directory
+PICTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pictures")
+SPRITE_FILES = {
+    "car": "car.png",
+    "wheel": "wheel.png",
+    "head": "headLarge2.png",
+    "torso": "torsoLarge.png",
+}
+
+
+# Loads the original image of a sprite once per process, the originals are never modified
+@lru_cache(maxsize=None)
+def load_sprite(name: str) -> pygame.Surface:
+    return pygame.image.load(os.path.join(PICTURES_DIR, SPRITE_FILES[name]))
+
+
+# Scaled and rotated sprites of one env, so drawing a body is a dictionary lookup and a blit.
+# Sprites are scaled once from the loaded originals, rotations are quantized to angle_steps per full turn and
+# the last cache_size rotated sprites are kept (least recently used ones are evicted first).
+class SpriteAtlas:
+    def __init__(self, angle_steps: int = 360, cache_size: int = 2048):
+        if angle_steps < 1:
+            raise ValueError(f"Angle steps must be at least 1, got {angle_steps}")
+        self.angle_steps = angle_steps
+        self.cache_size = cache_size
+        self.scaled_sprites = {}  # (name, size) -> scaled sprite
+        self.rotated_sprites = OrderedDict()  # (name, size, angle step) -> rotated sprite, in order of last use
+
+    # Returns sprite name ("car", "wheel", "head" or "torso") scaled to size (width, height) in pixels
+    def scaled(self, name: str, size: tuple[int, int]) -> pygame.Surface:
+        key = (name, size)
+        sprite = self.scaled_sprites.get(key)
+        if sprite is None:
+            sprite = pygame.transform.scale(load_sprite(name), size)
+            self.scaled_sprites[key] = sprite
+        return sprite
+
+    # Returns the scaled sprite rotated counterclockwise by degrees, rounded to the nearest angle step
+    def rotated(self, name: str, size: tuple[int, int], degrees: float) -> pygame.Surface:
+        step = round(degrees % 360 * self.angle_steps / 360) % self.angle_steps
+        key = (name, size, step)
+        sprite = self.rotated_sprites.get(key)
+        if sprite is None:
+            sprite = pygame.transform.rotate(self.scaled(name, size), step * 360 / self.angle_steps)
+            self.rotated_sprites[key] = sprite
+            if len(self.rotated_sprites) > self.cache_size:
+                self.rotated_sprites.popitem(last=False)
+        else:
+            self.rotated_sprites.move_to_end(key)
+        return sprite
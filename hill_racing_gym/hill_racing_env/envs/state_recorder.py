@@ -0,0 +1,131 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+import numpy as np
+from Box2D import b2World
+from . import agent
+from . import ground
+from . import hill_racing
+
+# Bodies of the car whose state is recorded, in column order
+STATE_BODIES = ["chassis", "back_wheel", "front_wheel", "head", "torso"]
+# A recorded frame holds the x, y (meters) and angle (radians) of every body, the camera pan (pixels) and whether the
+# agent is dead
+STATE_COLUMNS = 3 * len(STATE_BODIES) + 3
+
+
+# Returns the Box2D bodies of an agent in the order of STATE_BODIES
+def agent_bodies(racer: 'agent.Agent') -> list:
+    car = racer.car
+    return [car.chassis_body, car.wheels[0].body, car.wheels[1].body, car.person.head.body, car.person.torso.body]
+
+
+# The recorded frames of one episode and the ground they were recorded on. The ground vertices are referenced, not
+# copied, they are never modified after generation. The seed is None when the ground was not generated from a seed
+class StateRecording:
+    def __init__(self, states: np.ndarray, vertices: np.ndarray, seed: Optional[int], difficulty: int,
+                 original_noise: bool, spawning_y: float):
+        self.states = states  # float32 array, (frames, STATE_COLUMNS)
+        self.vertices = vertices
+        self.seed = seed
+        self.difficulty = difficulty
+        self.original_noise = original_noise
+        self.spawning_y = spawning_y
+
+    def __len__(self):
+        return len(self.states)
+
+
+# Records the body states of an agent every frame into a float32 buffer that doubles in size when it is full
+class StateRecorder:
+    def __init__(self, capacity: int = 1200):
+        self.buffer = np.zeros((capacity, STATE_COLUMNS), dtype=np.float32)
+        self.length = 0  # Number of frames recorded in this episode
+        self.ground: Optional['ground.Ground'] = None
+        self.seed = None
+
+    # Starts recording a new episode on the given ground
+    def reset(self, terrain: 'ground.Ground', seed: Optional[int] = None):
+        self.length = 0
+        self.ground = terrain
+        self.seed = seed
+
+    def record(self, racer: 'agent.Agent'):
+        if self.length == len(self.buffer):  # Episode is longer than the buffer, double it
+            self.buffer = np.concatenate((self.buffer, np.zeros_like(self.buffer)))
+        row = self.buffer[self.length]
+        for i, body in enumerate(agent_bodies(racer)):
+            position = body.position
+            row[3 * i] = position.x
+            row[3 * i + 1] = position.y
+            row[3 * i + 2] = body.angle
+        row[-3] = racer.pan_x
+        row[-2] = racer.pan_y
+        row[-1] = racer.dead
+        self.length += 1
+
+    # Returns a copy of the frames recorded in this episode
+    def recording(self) -> StateRecording:
+        return StateRecording(self.buffer[:self.length].copy(), self.ground.vertices, self.seed,
+                              self.ground.difficulty, self.ground.original_noise, self.ground.spawning_y)
+
+
+# Renders frames start to end (exclusive) of a recording to image files in directory, returns the number of frames.
+# The ground and car are rebuilt in a world that is never stepped, the bodies are moved to the recorded states
+def render_frames(recording: StateRecording, directory: str, start: int, end: int, extension: str = "png") -> int:
+    # Rendering modules are only imported by the renderer, recording does not need pygame
+    import pygame
+    from . import sprite_atlas
+    world = b2World(gravity=(0, hill_racing.GRAVITY), doSleep=True)
+    terrain = ground.Ground(original_noise=recording.original_noise, difficulty=recording.difficulty)
+    terrain.load_vertices(recording.vertices)
+    racer = agent.Agent(real_world=world, spawning_y=recording.spawning_y)
+    racer.add_to_world()
+    bodies = agent_bodies(racer)
+    atlas = sprite_atlas.SpriteAtlas()
+    surface = pygame.Surface((hill_racing.SCREEN_WIDTH, hill_racing.SCREEN_HEIGHT))
+    for frame in range(start, end):
+        state = recording.states[frame].tolist()
+        for i, body in enumerate(bodies):
+            body.transform = ((state[3 * i], state[3 * i + 1]), state[3 * i + 2])
+        racer.pan_x, racer.pan_y, racer.dead = state[-3], state[-2], bool(state[-1])
+        hill_racing.draw_scene(surface, terrain, racer, atlas)
+        pygame.image.save(surface, os.path.join(directory, f"frame_{frame:05d}.{extension}"))
+    return end - start
+
+
+# Renders all frames of a recording to directory/frame_00000.png and onwards, split into chunks of chunk_frames that
+# are rendered by a pool of worker processes (workers=1 renders in this process). Compressing PNGs takes most of the
+# time, extension="bmp" writes uncompressed images. The image sequence can be turned into a video with for example:
+# ffmpeg -framerate 60 -i frame_%05d.png video.mp4
+def render_recording(recording: StateRecording, directory: str, workers: Optional[int] = None,
+                     chunk_frames: int = 120, extension: str = "png") -> int:
+    os.makedirs(directory, exist_ok=True)
+    chunks = [(start, min(start + chunk_frames, len(recording))) for start in range(0, len(recording), chunk_frames)]
+    if workers == 1:
+        return sum(render_frames(recording, directory, start, end, extension) for start, end in chunks)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(render_frames, recording, directory, start, end, extension) for start, end in chunks]
+        return sum(future.result() for future in futures)
+
+
+# Records an episode of random (mostly gas) actions headless and renders it afterwards,
+# e.g. python -m hill_racing_env.envs.state_recorder frames/
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record an episode and render it to an image sequence")
+    parser.add_argument("directory", help="Directory the frames are written to")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the terrain")
+    parser.add_argument("--steps", type=int, default=hill_racing.FPS * 10, help="Maximum number of steps")
+    parser.add_argument("--workers", type=int, default=None, help="Number of render processes")
+    args = parser.parse_args()
+
+    env = hill_racing.HillRacingEnv(record_states=True)
+    env.reset(seed=args.seed)
+    rng = np.random.default_rng(args.seed)
+    for _ in range(args.steps):
+        _, _, terminated, truncated, _ = env.step(int(rng.choice(3, p=[0.1, 0.8, 0.1])))
+        if terminated or truncated:
+            break
+    frames = render_recording(env.state_recorder.recording(), args.directory, workers=args.workers)
+    print(f"Rendered {frames} frames to {args.directory}")
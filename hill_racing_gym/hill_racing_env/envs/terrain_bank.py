@@ -0,0 +1,103 @@
+import argparse
+import os
+import numpy as np
+from Box2D import b2World
+from . import ground
+from . import hill_racing
+from typing import Iterable, Optional
+
+
+# Path of the index file that belongs to a terrain bank file
+def index_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".index.npz"
+
+
+# Pre-generates the validated ground vertices for a range of seeds and stores them in one memory-mappable .npy file.
+# The seed -> row index and the spawn heights are stored next to it in a small index file.
+def build_terrain_bank(path: str, seeds: Iterable[int], original_noise: bool = False,
+                       difficulty: Optional[int] = None) -> list[int]:
+    if difficulty is None:
+        difficulty = hill_racing.DIFFICULTY
+    bank_seeds = []
+    bank_spawning_y = []
+    bank_vertices = []
+    skipped_seeds = []
+    for seed in seeds:
+        try:  # The same ground (and retries) as the env generates for this seed
+            terrain = ground.generate_ground(seed, original_noise, difficulty)
+        except RuntimeError:  # All attempts are too steep for this seed, it can not be used
+            skipped_seeds.append(seed)
+            continue
+        bank_seeds.append(seed)
+        bank_spawning_y.append(terrain.spawning_y)
+        bank_vertices.append(terrain.vertices)
+    if not bank_seeds:
+        raise ValueError("None of the seeds generate ground that is not too steep")
+
+    order = np.argsort(bank_seeds)  # Sorted seeds, so we can binary search the index
+    vertices = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32,
+                                         shape=(len(bank_seeds),) + bank_vertices[0].shape)
+    for row, i in enumerate(order):
+        vertices[row] = bank_vertices[i]
+    vertices.flush()
+    del vertices
+    np.savez(index_path(path),
+             seeds=np.array(bank_seeds, dtype=np.int64)[order],
+             spawning_y=np.array(bank_spawning_y, dtype=np.float64)[order],
+             original_noise=original_noise,
+             difficulty=difficulty,
+             distance=hill_racing.GROUND_DISTANCE)
+    return skipped_seeds
+
+
+# Read-only view on a terrain bank, the vertices are memory-mapped so all processes share the same pages
+class TerrainBank:
+    def __init__(self, path: str):
+        self.path = path
+        self.vertices = np.load(path, mmap_mode="r")
+        with np.load(index_path(path)) as index:
+            self.seeds = index["seeds"]
+            self.spawning_y = index["spawning_y"]
+            self.original_noise = bool(index["original_noise"])
+            self.difficulty = int(index["difficulty"])
+            self.distance = int(index["distance"])
+
+    def __len__(self):
+        return len(self.seeds)
+
+    def __contains__(self, seed: int):
+        return self._row(seed) is not None
+
+    # Returns the row of the seed in the bank or None when the seed is not in the bank
+    def _row(self, seed: int) -> Optional[int]:
+        row = int(np.searchsorted(self.seeds, seed))
+        if row < len(self.seeds) and self.seeds[row] == seed:
+            return row
+        return None
+
+    # Returns the ground of a seed with its vertices as a (zero-copy) view of the memory-mapped bank
+    def load_ground(self, seed: int, world: b2World = None) -> 'ground.Ground':
+        row = self._row(seed)
+        if row is None:
+            raise KeyError(f"Seed {seed} is not in terrain bank {self.path}")
+        terrain = ground.Ground(world, original_noise=self.original_noise, difficulty=self.difficulty)
+        terrain.load_vertices(self.vertices[row])
+        terrain.spawning_y = float(self.spawning_y[row])  # Spawn location of this terrain
+        terrain.seed = seed
+        return terrain
+
+
+# e.g. python -m hill_racing_env.envs.terrain_bank terrain_bank.npy --stop 1000
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-generate the terrain of a range of seeds into a terrain bank")
+    parser.add_argument("path", help="Output .npy file of the terrain bank")
+    parser.add_argument("--start", type=int, default=0, help="First seed of the range")
+    parser.add_argument("--stop", type=int, default=1000, help="End of the seed range (exclusive)")
+    parser.add_argument("--original-noise", action="store_true", help="Use the original perlin noise")
+    parser.add_argument("--difficulty", type=int, default=hill_racing.DIFFICULTY, help="Difficulty of the terrain")
+    args = parser.parse_args()
+
+    skipped = build_terrain_bank(args.path, range(args.start, args.stop), original_noise=args.original_noise,
+                                 difficulty=args.difficulty)
+    print(f"Stored {args.stop - args.start - len(skipped)} terrains in {args.path}, "
+          f"skipped {len(skipped)} seeds with too steep ground")
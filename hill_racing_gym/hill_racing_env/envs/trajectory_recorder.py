@@ -0,0 +1,44 @@
+import numpy as np
+
+TRAJECTORY_MODES = ["off", "ring", "full"]
+
+
+# Records the trajectory of an episode as rows of (step, x-position, y-position) in meters.
+# "full" stores the whole episode in a preallocated array that doubles in size when an episode is longer than expected,
+# "ring" only keeps the last capacity frames and "off" records nothing.
+class TrajectoryRecorder:
+    def __init__(self, mode: str = "off", capacity: int = 1200):
+        if mode not in TRAJECTORY_MODES:
+            raise ValueError(f"Unknown trajectory mode {mode}, choose from {TRAJECTORY_MODES}")
+        if capacity < 1:
+            raise ValueError(f"Trajectory capacity must be at least 1, got {capacity}")
+        self.mode = mode
+        self.capacity = capacity
+        self.buffer = np.zeros((capacity if mode != "off" else 0, 3), dtype=np.float64)
+        self.length = 0  # Number of frames recorded in this episode
+
+    def reset(self):
+        self.length = 0
+
+    def record(self, step: int, pos_x: float, pos_y: float):
+        if self.mode == "off":
+            return
+        if self.mode == "ring":
+            row = self.buffer[self.length % self.capacity]
+        else:
+            if self.length == len(self.buffer):  # Episode is longer than the buffer, double it
+                self.buffer = np.concatenate((self.buffer, np.zeros_like(self.buffer)))
+            row = self.buffer[self.length]
+        row[0] = step
+        row[1] = pos_x
+        row[2] = pos_y
+        self.length += 1
+
+    # Returns a copy of the recorded frames in chronological order, or None when recording is off
+    def trajectory(self):
+        if self.mode == "off":
+            return None
+        if self.mode == "ring" and self.length > self.capacity:
+            start = self.length % self.capacity
+            return np.concatenate((self.buffer[start:], self.buffer[:start]))
+        return self.buffer[:self.length].copy()
@@ -1,17 +1,21 @@
 import math
 from Box2D import *
-import pygame
-import hill_racing
+from . import hill_racing
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from . import sprite_atlas
 
 
 class Wheel:
     def __init__(self, x, y, r, chassis_body=None, world=None):
-        self.starting_position = pygame.Vector2(x, y)
+        self.starting_position = hill_racing.Position(x, y)
         self.id = "wheel"
         self.radius = r
         self.body = None
         self.world = world
         self.on_ground = False
+        self.ground_contacts = 0  # Number of touching contacts of the wheel and its rim with the ground
         # Create wheel
         self.create_wheel()
         # Wheel rim body definition
@@ -29,7 +33,7 @@ class Wheel:
             friction=0.99,
             restitution=0.2,
             shape=b2CircleShape(radius=(self.radius / hill_racing.SCALE)),
-            groupIndex=-1,
+            groupIndex=hill_racing.CAR_GROUP,
         )
         self.rim_body = self.world.CreateBody(body_def)
         self.rim_body.CreateFixture(fix_def)
@@ -67,6 +71,16 @@ class Wheel:
 
         self.body.angularDamping = 1.8
 
+    # The wheel and rim have a contact with every ground edge they touch, the wheel is on the ground as long as one of
+    # them touches. Counting the contacts keeps on_ground independent of the order Box2D reports them in
+    def add_ground_contact(self):
+        self.ground_contacts += 1
+        self.on_ground = True
+
+    def remove_ground_contact(self):
+        self.ground_contacts -= 1
+        self.on_ground = self.ground_contacts > 0
+
     def create_wheel(self):
         wheel_body = b2BodyDef(
             type=b2_dynamicBody,
@@ -83,24 +97,21 @@ class Wheel:
             shape=b2CircleShape(radius=self.radius / hill_racing.SCALE),
             categoryBits=hill_racing.WHEEL_CATEGORY,
             maskBits=hill_racing.WHEEL_MASK,
+            groupIndex=hill_racing.CAR_GROUP,
         )
         self.body = self.world.CreateBody(wheel_body)
         self.body.CreateFixture(wheel_fixture)
         self.body.userData = self
 
-    def draw_wheel(self, surface_screen):
+    def draw_wheel(self, surface_screen, atlas: 'sprite_atlas.SpriteAtlas', pan_x: float = 0, pan_y: float = 0):
         # Scale back position of wheel body
         pos_x = self.body.position.x * hill_racing.SCALE
         pos_y = self.body.position.y * hill_racing.SCALE
         degrees_angle = math.degrees(-self.body.angle) % 360
-        # Scale wheel
-        hill_racing.wheel_sprite = pygame.transform.scale(
-            hill_racing.wheel_sprite, (hill_racing.HEAD_SIZE, hill_racing.HEAD_SIZE)
-        )
-        # Rotate the wheel by body angle
-        rotated_wheel_sprite = pygame.transform.rotate(hill_racing.wheel_sprite, degrees_angle)
+        # Get the scaled wheel sprite rotated by body angle
+        rotated_wheel_sprite = atlas.rotated("wheel", (hill_racing.HEAD_SIZE, hill_racing.HEAD_SIZE), degrees_angle)
         # Update the wheel on screen position
         surface_screen.blit(
             source=rotated_wheel_sprite,
-            dest=(-self.radius + pos_x - hill_racing.panX, -self.radius + pos_y - hill_racing.panY),
+            dest=(-self.radius + pos_x - pan_x, -self.radius + pos_y - pan_y),
         )
@@ -4,5 +4,7 @@ setup(
     name="hill_racing_env",
     version="0.0.1",
     install_requires=["gymnasium", "pygame"],
-    # packages=find_packages(),
+    packages=find_packages(),
+    extras_require={"evaluate": ["stable-baselines3"]},
+    package_data={"hill_racing_env.envs": ["pictures/*.png", "baseline_models/*.zip"]},
 )
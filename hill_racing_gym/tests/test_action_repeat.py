@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from hill_racing_env.envs import hill_racing
+
+ACTION_REPEAT = 4
+
+
+# A step with action_repeat has to equal action_repeat steps with the same action, with the rewards summed, up to the
+# frame in which the episode ends. Seeds 0 and 1 crash in the middle of a step, with max_steps=50 the car gets stuck
+# after 51 frames, also in the middle of a step
+@pytest.mark.parametrize("seed, max_steps, p", [(0, 1000, [0.1, 0.8, 0.1]), (1, 1000, [0.1, 0.8, 0.1]),
+                                                (2, 50, [1.0, 0.0, 0.0])])
+def test_action_repeat_equals_repeated_steps(seed, max_steps, p):
+    env = hill_racing.HillRacingEnv(action_repeat=ACTION_REPEAT, max_steps=max_steps, observation_mode="flat")
+    frame_env = hill_racing.HillRacingEnv(action_repeat=1, max_steps=max_steps, observation_mode="flat")
+    env.reset(seed=seed)
+    frame_env.reset(seed=seed)
+    rng = np.random.default_rng(seed)
+    for _ in range(1000):
+        action = int(rng.choice(3, p=p))
+        observation, reward, terminated, truncated, info = env.step(action)
+        frame_reward = 0
+        for frame in range(ACTION_REPEAT):
+            frame_observation, frame_step_reward, frame_terminated, frame_truncated, frame_info = \
+                frame_env.step(action)
+            frame_reward += frame_step_reward
+            if frame_terminated or frame_truncated:
+                break
+        assert np.array_equal(observation, frame_observation)
+        assert reward == frame_reward
+        assert (terminated, truncated) == (frame_terminated, frame_truncated)
+        assert info == frame_info
+        if terminated or truncated:
+            break
+    assert terminated or truncated
+    assert frame < ACTION_REPEAT - 1  # The episode ended before the last frame of the step
+    env.close()
+    frame_env.close()
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+from hill_racing_env.envs import hill_racing
+from hill_racing_env.envs.hill_racing_vector import HillRacingVectorEnv
+
+
+# Plays an episode with seeded random actions and returns the observations and rewards
+def play_episode(env, seed: int, vector: bool = False) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    observation, _ = env.reset(seed=[seed] if vector else seed)
+    transitions = [np.append(observation, 0)]
+    while True:
+        action = rng.integers(3)
+        observation, reward, terminated, truncated, _ = env.step(np.array([action]) if vector else int(action))
+        transitions.append(np.append(observation, reward))
+        if np.any(terminated) or np.any(truncated):
+            return np.array(transitions)
+
+
+# An episode plays the same in a fresh env as in an env that already played an episode on another ground
+@pytest.mark.parametrize("seed", [3, 9])
+def test_episode_independent_of_earlier_episodes(seed):
+    expected = play_episode(hill_racing.HillRacingEnv(observation_mode="flat"), seed)
+    env = hill_racing.HillRacingEnv(observation_mode="flat")
+    play_episode(env, seed + 100)
+    assert np.array_equal(play_episode(env, seed), expected)
+
+
+@pytest.mark.parametrize("seed", [3, 9])
+def test_vector_episode_independent_of_earlier_episodes(seed):
+    expected = play_episode(HillRacingVectorEnv(1), seed, vector=True)
+    env = HillRacingVectorEnv(1)
+    play_episode(env, seed + 100, vector=True)
+    assert np.array_equal(play_episode(env, seed, vector=True), expected)
@@ -0,0 +1,39 @@
+import os
+import pytest
+from hill_racing_env.envs.evaluate import BASELINE_MODELS_DIR, evaluate, model_env_kwargs
+
+SEEDS = [7, 3, 11, 0, 5]
+# A short-lived checkpoint, so its episodes are quick
+CHECKPOINT = os.path.join(BASELINE_MODELS_DIR, "ppo_base_wheel_speed_soft_300_0.zip")
+
+
+def evaluate_seeds(policy: str, workers: int, shard_size: int = 4) -> list:
+    return list(evaluate(policy, SEEDS, workers=workers, shard_size=shard_size))
+
+
+# Results come in the order of the seeds and do not depend on how the seeds are spread over the workers
+def test_random_policy_results_independent_of_workers():
+    expected = evaluate_seeds("random", workers=1)
+    assert [result.seed for result in expected] == SEEDS
+    assert evaluate_seeds("random", workers=2, shard_size=1) == expected
+    assert evaluate_seeds("random", workers=2, shard_size=3) == expected
+
+
+def test_checkpoint_results_independent_of_workers():
+    pytest.importorskip("stable_baselines3")
+    expected = evaluate_seeds(CHECKPOINT, workers=1)
+    assert [result.seed for result in expected] == SEEDS
+    assert evaluate_seeds(CHECKPOINT, workers=2, shard_size=2) == expected
+
+
+def test_model_env_kwargs():
+    assert model_env_kwargs("ppo_cont_wheel_speed_soft_1000_0.zip") == {
+        "action_space": "continuous", "reward_function": "wheel_speed", "reward_type": "soft"}
+    assert model_env_kwargs("ppo_base_aggressive_1000_0.zip") == {
+        "action_space": "discrete_3", "reward_function": "distance", "reward_type": "aggressive"}
+
+
+def test_missing_checkpoint():
+    pytest.importorskip("stable_baselines3")
+    with pytest.raises(FileNotFoundError):
+        list(evaluate("missing.zip", SEEDS))
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from hill_racing_env.envs import hill_racing
+
+# The features of the dict observation in the order of the flat observation
+DICT_KEYS = ["chassis_position", "chassis_angle", "wheels_speed", "on_ground"]
+EXTRAS = ["chassis_velocity", "chassis_angular_velocity", "airtime", "terrain_heights", "terrain_slopes"]
+
+
+# Returns the extra features of the car in env, in the order of EXTRAS
+def expected_extras(env: 'hill_racing.HillRacingEnv', lookahead: int, lookahead_skip: int) -> np.ndarray:
+    chassis = env.agent.car.chassis_body
+    heights = env.ground.heights_ahead(env.agent.car.pos_x, lookahead + 1, lookahead_skip)
+    return np.concatenate([tuple(chassis.linearVelocity), [chassis.angularVelocity, env.agent.airtime_counter],
+                           env.agent.car.pos_y - heights[:-1],
+                           (heights[:-1] - heights[1:]) / (lookahead_skip * env.ground.height_spacing)])
+
+
+# The flat observation starts with the features of the dict observation, the extras follow in the given order
+@pytest.mark.parametrize("extras, lookahead_skip", [((), 1), (EXTRAS, 1), (EXTRAS, 3)])
+def test_flat_observation_equals_dict_observation(extras, lookahead_skip):
+    lookahead = 6
+    dict_env = hill_racing.HillRacingEnv(observation_mode="dict")
+    flat_env = hill_racing.HillRacingEnv(observation_mode="flat", observation_extras=extras,
+                                         terrain_lookahead=lookahead, terrain_lookahead_skip=lookahead_skip)
+    assert flat_env.observation_space.shape == (7 + (len(extras) and 4 + 2 * lookahead),)
+    dict_observation, _ = dict_env.reset(seed=2)
+    flat_observation, _ = flat_env.reset(seed=2)
+    rng = np.random.default_rng(2)
+    for _ in range(300):
+        flattened = np.concatenate([dict_observation[key] for key in DICT_KEYS]).astype(np.float32)
+        assert np.array_equal(flat_observation[:len(flattened)], flattened)
+        if extras:
+            assert np.array_equal(flat_observation[len(flattened):],
+                                  expected_extras(dict_env, lookahead, lookahead_skip).astype(np.float32))
+        action = int(rng.choice(3, p=[0.1, 0.8, 0.1]))
+        dict_observation, _, terminated, truncated, _ = dict_env.step(action)
+        flat_observation, *_ = flat_env.step(action)
+        if terminated or truncated:
+            break
+    dict_env.close()
+    flat_env.close()
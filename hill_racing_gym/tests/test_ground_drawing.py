@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from hill_racing_env.envs import ground, hill_racing
+
+pygame = pytest.importorskip("pygame")
+
+# Tolerated number of pixels of a frame that may differ from the full ground polygon, a polygon rasterizer is free to
+# round the edges of the off-screen part of the outline differently, which can only touch pixels along the screen border
+MAX_DIFFERENT_PIXELS = 16
+# Pans that differed from the full ground before the clipped polygon was closed at the ends of the ground
+CLOSING_EDGE_PANS = [(0, 26315.38), (0, 25538.46), (0, 29000.5), (0, 29423.08), (2, 26315.38)]
+
+
+# The ground as it was drawn before clipping, every vertex in one polygon
+def draw_full_ground(terrain: 'ground.Ground', surface_screen, pan_x: float, pan_y: float):
+    bottom_y = hill_racing.SCREEN_HEIGHT + terrain.grass_thickness * 2 - pan_y
+    pixel_vertices = (terrain.vertices[:-2] * np.float32(hill_racing.SCALE)).astype(np.float64)
+    vertices = [(0 - pan_x, bottom_y), *(pixel_vertices - (pan_x, pan_y)).tolist(),
+                (terrain.distance - pan_x, bottom_y)]
+    pygame.draw.polygon(surface_screen, (88, 35, 0), vertices)
+    pygame.draw.polygon(surface_screen, (0, 120, 0), vertices, width=terrain.grass_thickness * 2)
+
+
+def different_pixels(terrain: 'ground.Ground', pan_x: float, pan_y: float) -> int:
+    expected = pygame.Surface((hill_racing.SCREEN_WIDTH, hill_racing.SCREEN_HEIGHT))
+    actual = pygame.Surface((hill_racing.SCREEN_WIDTH, hill_racing.SCREEN_HEIGHT))
+    draw_full_ground(terrain, expected, pan_x, pan_y)
+    terrain.draw_ground(actual, pan_x, pan_y)
+    return int((pygame.surfarray.array3d(expected) != pygame.surfarray.array3d(actual)).any(axis=2).sum())
+
+
+@pytest.mark.parametrize("seed, pan_x", CLOSING_EDGE_PANS)
+@pytest.mark.parametrize("pan_y", [0, -20.5, 400])
+def test_closing_edge_pans(seed, pan_x, pan_y):
+    terrain = ground.generate_ground(seed)
+    assert different_pixels(terrain, pan_x, pan_y) <= MAX_DIFFERENT_PIXELS
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_pans_along_ground(seed):
+    terrain = ground.generate_ground(seed)
+    vertices = terrain.vertices.copy()
+    for i, pan_x in enumerate(np.linspace(-300, terrain.distance + 300, 129)):
+        assert different_pixels(terrain, float(pan_x), -20.5 if i % 3 == 0 else 0) <= MAX_DIFFERENT_PIXELS
+    # Drawing never modifies the physics vertices
+    assert np.array_equal(vertices, terrain.vertices)
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+from hill_racing_env.envs import hill_racing
+
+
+# Every info level races the same, "summary" and "full" end an episode with the same stats. Seed 0 crashes, with
+# max_steps=50 and only idling the car on seed 2 gets stuck
+@pytest.mark.parametrize("seed, max_steps, p, end_reason", [(0, 1000, [0.1, 0.8, 0.1], "dead"),
+                                                            (2, 50, [1.0, 0.0, 0.0], "stuck")])
+def test_summary_equals_full_final_stats(seed, max_steps, p, end_reason):
+    envs = {info_level: hill_racing.HillRacingEnv(info_level=info_level, max_steps=max_steps,
+                                                  observation_mode="flat")
+            for info_level in hill_racing.INFO_LEVELS}
+    for env in envs.values():
+        env.reset(seed=seed)
+    rng = np.random.default_rng(seed)
+    for steps in range(1, 1000):
+        action = int(rng.choice(3, p=p))
+        transitions = {info_level: env.step(action) for info_level, env in envs.items()}
+        observation, reward, terminated, truncated, _ = transitions["full"]
+        for other in transitions.values():
+            assert np.array_equal(other[0], observation) and other[1:4] == (reward, terminated, truncated)
+        infos = {info_level: transition[4] for info_level, transition in transitions.items()}
+        assert infos["none"] == {}
+        if terminated or truncated:
+            break
+        assert infos["summary"] == {}
+    summary = infos["summary"]
+    assert summary == {key: infos["full"][key] for key in summary}
+    assert summary["steps"] == steps
+    assert summary["end_reason"] == end_reason
+    for env in envs.values():
+        env.close()
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from hill_racing_env.envs import hill_racing
+from hill_racing_env.envs.hill_racing_multi_agent import HillRacingMultiAgentEnv
+
+
+# One agent on the shared ground has to race exactly like the single env on the same seed
+@pytest.mark.parametrize("streaming_ground", [False, True])
+def test_one_agent_equals_single_env(streaming_ground):
+    multi_agent_env = HillRacingMultiAgentEnv(1, streaming_ground=streaming_ground)
+    env = hill_racing.HillRacingEnv(streaming_ground=streaming_ground, observation_mode="flat")
+    observations, _ = multi_agent_env.reset(seed=3)
+    observation, _ = env.reset(seed=3)
+    assert np.array_equal(observations[0], observation)
+
+    rng = np.random.default_rng(2)
+    for _ in range(400):
+        action = int(rng.choice(3, p=[0.1, 0.8, 0.1]))
+        observations, rewards, terminations, truncations, _ = multi_agent_env.step(np.array([action]))
+        observation, reward, terminated, truncated, _ = env.step(action)
+        assert np.array_equal(observations[0], observation)
+        assert (rewards[0], terminations[0], truncations[0]) == (reward, terminated, truncated)
+        if terminated or truncated:
+            break
+    multi_agent_env.close()
+    env.close()
+
+
+# Before the first reset there is no ground to respawn on, so the mask is ignored and every agent is spawned
+def test_reset_mask_before_first_reset():
+    env = HillRacingMultiAgentEnv(3)
+    observations, _ = env.reset(options={"reset_mask": np.array([True, False, False])})
+    assert all(racer is not None for racer in env.agents)
+    assert np.isfinite(observations).all()
+    env.close()
+
+
+# A masked reset only respawns the given agents on the same ground
+def test_reset_mask_respawns_given_agents():
+    env = HillRacingMultiAgentEnv(2)
+    spawn_observations, _ = env.reset(seed=1)
+    vertices = env.env.ground.vertices
+    for _ in range(50):
+        observations, *_ = env.step(np.ones(2, dtype=np.int64))
+    observations, _ = env.reset(options={"reset_mask": np.array([True, False])})
+    assert env.env.ground.vertices is vertices
+    assert np.array_equal(observations[0], spawn_observations[0])
+    assert not np.array_equal(observations[1], spawn_observations[1])
+    env.close()
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from hill_racing_env.envs import hill_racing
+
+
+# Plays the actions from the current state and returns the observations and rewards until the episode ends
+def play_branch(env: 'hill_racing.HillRacingEnv', actions: np.ndarray) -> np.ndarray:
+    transitions = []
+    for action in actions:
+        observation, reward, terminated, truncated, _ = env.step(int(action))
+        transitions.append(np.append(observation, reward))
+        if terminated or truncated:
+            break
+    return np.array(transitions)
+
+
+# Every restore of a snapshot has to continue the same way, also after other steps and in another env on the same ground
+@pytest.mark.parametrize("physics_profile", ["accurate", "fast"])
+def test_restored_branches_repeat(physics_profile):
+    env = hill_racing.HillRacingEnv(physics_profile=physics_profile, observation_mode="flat", max_steps=10 ** 6)
+    env.reset(seed=3)
+    rng = np.random.default_rng(0)
+    for action in rng.choice(3, size=150, p=[0.1, 0.8, 0.1]):
+        env.step(int(action))
+    state = env.get_state()
+    actions = rng.choice(3, size=300, p=[0.1, 0.8, 0.1])
+
+    env.set_state(state)
+    assert np.array_equal(env.get_state(), state)
+    branch = play_branch(env, actions)
+    for _ in range(50):
+        env.step(2)
+    env.set_state(state)
+    assert np.array_equal(play_branch(env, actions), branch)
+
+    other_env = hill_racing.HillRacingEnv(physics_profile=physics_profile, observation_mode="flat",
+                                          max_steps=10 ** 6)
+    other_env.reset(seed=3)
+    other_env.set_state(state)
+    assert np.array_equal(play_branch(other_env, actions), branch)
+    env.close()
+    other_env.close()
+
+
+def test_snapshot_of_other_ground():
+    env = hill_racing.HillRacingEnv()
+    env.reset(seed=3)
+    state = env.get_state()
+    env.reset(seed=4)
+    with pytest.raises(ValueError):
+        env.set_state(state)
+    with pytest.raises(ValueError):
+        env.set_state(state[:-1])
+    env.close()
+
+
+# Seeds that float64 can not tell apart are told apart by the snapshot, seeds from 2**64 on can not be stored
+def test_snapshot_of_large_seed():
+    env = hill_racing.HillRacingEnv()
+    env.reset(seed=2 ** 53 + 1)
+    env.step(1)
+    state = env.get_state()
+    env.reset(seed=2 ** 53)
+    with pytest.raises(ValueError):
+        env.set_state(state)
+    env.reset(seed=2 ** 53 + 1)
+    env.set_state(state)
+    assert np.array_equal(env.get_state(), state, equal_nan=True)
+
+    env.reset(seed=2 ** 64 - 1)
+    env.set_state(env.get_state())
+    env.reset(seed=2 ** 64)
+    with pytest.raises(ValueError):
+        env.get_state()
+    env.close()
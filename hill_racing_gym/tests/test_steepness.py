@@ -0,0 +1,37 @@
+import warnings
+import pytest
+from hill_racing_env.envs import benchmark, ground, hill_racing
+
+# Difficulty at which some of the first seeds give too steep ground, seeds 0, 6 and 9 do
+STEEP_DIFFICULTY = -60
+
+
+# The windowed validator has to give the verdicts of the original O(n^2) check
+@pytest.mark.parametrize("seed", range(10))
+def test_verdict_equals_legacy_check(seed):
+    terrain = ground.Ground(difficulty=STEEP_DIFFICULTY)
+    terrain.randomize_ground(seed=seed)
+    too_steep, steep_range = terrain.check_steepness()
+    assert too_steep == benchmark.legacy_ground_too_steep(terrain)
+    if too_steep:
+        start, end = steep_range
+        assert 0 <= start < end <= terrain.distance / hill_racing.SCALE
+    else:
+        assert steep_range is None
+
+
+# generate_ground is silent and keeps the rejected ranges, the env warns once per reset
+def test_rejections_warn_once_per_reset(capsys):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        terrain = ground.generate_ground(0, difficulty=STEEP_DIFFICULTY)
+    assert len(terrain.rejected_ranges) > 0
+    assert not terrain.check_steepness()[0]
+    assert capsys.readouterr().out == ""
+
+    env = hill_racing.HillRacingEnv(difficulty=STEEP_DIFFICULTY)
+    with pytest.warns(UserWarning) as record:
+        env.reset(seed=0)
+    assert len(record) == 1
+    assert "seed 0" in str(record[0].message)
+    env.close()
@@ -0,0 +1,83 @@
+import random
+import numpy as np
+import pytest
+from hill_racing_env.envs import benchmark, ground, hill_racing, perlin
+
+
+# The vectorized terrain has to give exactly the heights of the original point-by-point loop
+@pytest.mark.parametrize("difficulty", [hill_racing.DIFFICULTY, -60])
+@pytest.mark.parametrize("seed", range(10))
+def test_terrain_equals_legacy_loop(seed, difficulty):
+    terrain = ground.Ground(difficulty=difficulty)
+    terrain.randomize_ground(seed=seed)
+    legacy = benchmark.legacy_randomize_ground(seed, difficulty=difficulty)
+    assert np.array_equal(terrain.vertices[:-2, 1], (legacy.astype(np.float64) / hill_racing.SCALE).astype(np.float32))
+    assert terrain.spawning_y == float(legacy[10]) - 100
+
+
+# The array version of the original noise has to give exactly the values of the scalar version, also for negative x
+@pytest.mark.parametrize("seed", range(3))
+def test_original_noise_array_equals_scalar(seed):
+    rng = random.Random(seed)
+    table = perlin.perlin_table(rng)
+    xs = np.concatenate((rng.uniform(0, 100000) + np.arange(0, 1000) / 500,
+                         np.random.default_rng(seed).uniform(-1000, 1000, size=1000)))
+    expected = [perlin.original_pnoise(x, table=table) for x in xs.tolist()]
+    assert np.array_equal(perlin.original_pnoise1_array(xs, table), expected)
+
+
+# The original noise terrain only depends on its seed, not on the shared random module
+def test_original_noise_terrain_from_seed():
+    terrains = []
+    for state in range(2):
+        random.seed(state)
+        terrain = ground.Ground(original_noise=True)
+        terrain.randomize_ground(seed=5)
+        terrains.append(terrain.vertices)
+    assert np.array_equal(terrains[0], terrains[1])
+
+
+# Retries of a too steep seed are derived from the seed, so the same seed always ends up on the same ground
+def test_retries_from_seed():
+    random.seed(0)
+    first = ground.generate_ground(0, difficulty=-60)
+    random.seed(1)
+    second = ground.generate_ground(0, difficulty=-60)
+    assert len(first.rejected_ranges) > 0
+    assert np.array_equal(first.vertices, second.vertices)
+    assert first.rejected_ranges == second.rejected_ranges
+
+
+def test_retries_are_bounded():
+    with pytest.raises(RuntimeError):
+        ground.generate_ground(0, difficulty=100, max_attempts=5)
+
+
+# On the surface heights_ahead has to give the heights of getPositions, at the vertices and between them
+@pytest.mark.parametrize("skip", [1, 3])
+def test_heights_ahead_equals_get_positions(skip):
+    terrain = ground.Ground()
+    terrain.randomize_ground(seed=1)
+    count = 10
+    last_start = len(terrain.heights) - skip * (count - 1) - 1  # The last vertex from which all heights are surface
+    xs = np.concatenate((terrain.vertices[:last_start + 1, 0].astype(np.float64),
+                         np.random.default_rng(1).uniform(-5, terrain.vertices[last_start, 0], size=1000)))
+    for x in xs.tolist():
+        assert np.array_equal(terrain.heights_ahead(x, count, skip),
+                              np.array(terrain.getPositions(x, count, skip), dtype=np.float32))
+
+
+# At the end of the ground getPositions follows the closing vectors to the bottom of the screen and heights_ahead
+# repeats the last surface height. Past the end neither raises
+def test_heights_at_end_of_ground():
+    terrain = ground.Ground()
+    terrain.randomize_ground(seed=1)
+    last_x, last_height = terrain.vertices[-3]
+    bottom = np.float32(hill_racing.SCREEN_HEIGHT / hill_racing.SCALE)
+    x = float(terrain.vertices[-5, 0])  # Three surface vertices left
+    assert np.array_equal(terrain.heights_ahead(x, 5), [*terrain.heights[-3:], last_height, last_height])
+    assert np.array_equal(np.array(terrain.getPositions(x, 5, 1), dtype=np.float32),
+                          [*terrain.heights[-3:], bottom, bottom])
+    for x in (float(last_x) + 0.1, terrain.distance / hill_racing.SCALE + 1):
+        assert np.array_equal(terrain.heights_ahead(x, 3), [last_height] * 3)
+        assert np.array_equal(np.array(terrain.getPositions(x, 3, 1), dtype=np.float32), [bottom] * 3)
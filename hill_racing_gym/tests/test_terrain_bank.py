@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from hill_racing_env.envs import ground, hill_racing, terrain_bank
+
+# Seed 0 is too steep at this difficulty, so the bank also has to store the retried ground
+DIFFICULTY = -60
+BANK_SEEDS = range(6)
+
+
+@pytest.fixture(scope="module")
+def bank_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("bank") / "terrain_bank.npy")
+    assert terrain_bank.build_terrain_bank(path, BANK_SEEDS, difficulty=DIFFICULTY) == []
+    return path
+
+
+# Plays a seeded episode with the same random actions and returns everything the env returned
+def play_episode(env: 'hill_racing.HillRacingEnv', seed: int, steps: int = 200) -> list:
+    actions = np.random.default_rng(seed).integers(0, 3, size=steps)
+    observation, _ = env.reset(seed=seed)
+    transitions = [observation]
+    for action in actions:
+        observation, reward, terminated, truncated, _ = env.step(int(action))
+        transitions.append((observation, reward, terminated, truncated))
+        if terminated or truncated:
+            break
+    return transitions
+
+
+@pytest.mark.parametrize("seed", BANK_SEEDS)
+def test_bank_ground_equals_generated_ground(bank_path, seed):
+    bank = terrain_bank.TerrainBank(bank_path)
+    generated = ground.generate_ground(seed, difficulty=DIFFICULTY)
+    loaded = bank.load_ground(seed)
+    assert np.array_equal(loaded.vertices, generated.vertices)
+    assert loaded.spawning_y == generated.spawning_y
+    assert loaded.seed == seed
+
+
+def test_missing_seed(bank_path):
+    bank = terrain_bank.TerrainBank(bank_path)
+    assert len(bank) == len(BANK_SEEDS)
+    assert 100 not in bank
+    with pytest.raises(KeyError):
+        bank.load_ground(100)
+
+
+# Episodes are the same with and without the bank, seeds that are not in the bank are generated as usual
+@pytest.mark.parametrize("seed", [0, 1, 100])
+def test_episodes_equal_with_bank(bank_path, seed):
+    env = hill_racing.HillRacingEnv(difficulty=DIFFICULTY)
+    bank_env = hill_racing.HillRacingEnv(difficulty=DIFFICULTY, terrain_bank=bank_path)
+    expected = play_episode(env, seed)
+    actual = play_episode(bank_env, seed)
+    assert len(actual) == len(expected)
+    for actual_transition, expected_transition in zip(actual, expected):
+        np.testing.assert_equal(actual_transition, expected_transition)
+    env.close()
+    bank_env.close()
+
+
+def test_bank_of_other_settings(bank_path):
+    env = hill_racing.HillRacingEnv(terrain_bank=bank_path)
+    with pytest.raises(ValueError):
+        env.reset(seed=0)
+    env.close()
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from hill_racing_env.envs import hill_racing
+from hill_racing_env.envs.trajectory_recorder import TrajectoryRecorder
+
+
+def frames(steps: range) -> np.ndarray:
+    return np.array([(step, step * 0.5, -step) for step in steps], dtype=np.float64)
+
+
+# The ring returns the last capacity frames oldest first, also when it wrapped around several times
+@pytest.mark.parametrize("length", [3, 5, 6, 13, 15])
+def test_ring_keeps_last_frames_in_order(length):
+    recorder = TrajectoryRecorder("ring", capacity=5)
+    for step, pos_x, pos_y in frames(range(length)):
+        recorder.record(int(step), pos_x, pos_y)
+    assert np.array_equal(recorder.trajectory(), frames(range(max(0, length - 5), length)))
+
+    # A new episode starts an empty trajectory, the frames of the last one are not returned
+    recorder.reset()
+    for step, pos_x, pos_y in frames(range(2)):
+        recorder.record(int(step), pos_x, pos_y)
+    assert np.array_equal(recorder.trajectory(), frames(range(2)))
+
+
+# The full trajectory grows beyond its initial capacity
+def test_full_keeps_all_frames():
+    recorder = TrajectoryRecorder("full", capacity=4)
+    for step, pos_x, pos_y in frames(range(11)):
+        recorder.record(int(step), pos_x, pos_y)
+    assert np.array_equal(recorder.trajectory(), frames(range(11)))
+    assert TrajectoryRecorder("off").trajectory() is None
+
+
+# The trajectory of the ring in the last info of an episode is the end of the full trajectory
+def test_ring_trajectory_is_end_of_full_trajectory():
+    trajectories = []
+    for trajectory_mode in ("full", "ring"):
+        env = hill_racing.HillRacingEnv(trajectory_mode=trajectory_mode, trajectory_length=50, info_level="summary")
+        env.reset(seed=0)
+        info = {}
+        while "trajectory" not in info:
+            *_, info = env.step(1)
+        trajectories.append(info["trajectory"])
+        env.close()
+    full, ring = trajectories
+    assert len(full) > 50
+    assert np.array_equal(ring, full[-50:])
+    assert np.array_equal(full[:, 0], np.arange(1, len(full) + 1))
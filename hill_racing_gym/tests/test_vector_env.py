@@ -0,0 +1,74 @@
+import gymnasium as gym
+import numpy as np
+import pytest
+from gymnasium.vector import AutoresetMode
+from hill_racing_env.envs import hill_racing
+from hill_racing_env.envs.hill_racing_vector import HillRacingVectorEnv
+
+NUM_ENVS = 3
+SEEDS = [10, 11, 12]
+
+
+# The vector env has to step every car exactly like NUM_ENVS separate envs with the same seeds and actions
+@pytest.mark.parametrize("reward_function", ["distance", "action", "wheel_speed", "airtime_distance"])
+def test_vector_env_equals_single_envs(reward_function):
+    vector_env = HillRacingVectorEnv(NUM_ENVS, reward_function=reward_function, autoreset_mode=AutoresetMode.DISABLED)
+    envs = [hill_racing.HillRacingEnv(reward_function=reward_function, observation_mode="flat")
+            for _ in range(NUM_ENVS)]
+    observations, _ = vector_env.reset(seed=SEEDS)
+    for i, env in enumerate(envs):
+        observation, _ = env.reset(seed=SEEDS[i])
+        assert np.array_equal(observations[i], observation)
+
+    rng = np.random.default_rng(0)
+    done = np.zeros(NUM_ENVS, dtype=np.bool_)
+    for _ in range(300):
+        actions = rng.choice(3, size=NUM_ENVS, p=[0.1, 0.8, 0.1])
+        observations, rewards, terminations, truncations, _ = vector_env.step(actions)
+        for i in np.flatnonzero(~done):
+            observation, reward, terminated, truncated, _ = envs[i].step(int(actions[i]))
+            assert np.array_equal(observations[i], observation)
+            assert (rewards[i], terminations[i], truncations[i]) == (reward, terminated, truncated)
+        done |= terminations | truncations
+        if done.all():
+            break
+    vector_env.close()
+    for env in envs:
+        env.close()
+
+
+# With autoreset every car has to follow Gymnasium's SyncVectorEnv over separate envs, also across the resets of the
+# episodes. Most actions brake, so episodes end early by getting stuck and the autoresets are tested
+@pytest.mark.parametrize("autoreset_mode", [AutoresetMode.NEXT_STEP, AutoresetMode.SAME_STEP])
+@pytest.mark.parametrize("action_repeat", [1, 4])
+def test_autoreset_equals_separate_envs(autoreset_mode, action_repeat):
+    env_kwargs = dict(max_steps=60, action_repeat=action_repeat)
+    vector_env = HillRacingVectorEnv(NUM_ENVS, autoreset_mode=autoreset_mode, **env_kwargs)
+    sync_env = gym.vector.SyncVectorEnv(
+        [lambda: hill_racing.HillRacingEnv(observation_mode="flat", **env_kwargs) for _ in range(NUM_ENVS)],
+        autoreset_mode=autoreset_mode)
+    observations, _ = vector_env.reset(seed=SEEDS)
+    expected_observations, _ = sync_env.reset(seed=SEEDS)
+    assert np.array_equal(observations, expected_observations)
+
+    rng = np.random.default_rng(0)
+    episodes = 0
+    for _ in range(200):
+        actions = rng.choice(3, size=NUM_ENVS, p=[0.6, 0.2, 0.2])
+        observations, rewards, terminations, truncations, infos = vector_env.step(actions)
+        expected = sync_env.step(actions)
+        assert np.array_equal(observations, expected[0])
+        assert np.array_equal(rewards, expected[1])
+        assert np.array_equal(terminations, expected[2]) and np.array_equal(truncations, expected[3])
+        done = terminations | truncations
+        episodes += done.sum()
+        if autoreset_mode == AutoresetMode.SAME_STEP and done.any():
+            expected_infos = expected[4]
+            assert np.array_equal(infos["_final_obs"], expected_infos["_final_obs"])
+            assert np.array_equal(infos["_final_info"], expected_infos["_final_info"])
+            for i in np.flatnonzero(done):
+                assert np.array_equal(infos["final_obs"][i], expected_infos["final_obs"][i])
+                assert infos["final_info"]["score"][i] == expected_infos["final_info"]["score"][i]
+    assert episodes >= NUM_ENVS  # Every car had at least one reset on average
+    vector_env.close()
+    sync_env.close()
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+from hill_racing_env.envs import hill_racing
+
+
+# Whether the wheel or its rim has a touching contact with the ground in the world
+def touches_ground(wheel) -> bool:
+    return any(edge.contact.touching and edge.other.userData.id == "ground"
+               for body in (wheel.body, wheel.rim_body) for edge in body.contacts)
+
+
+# A wheel touches the chain ground with a contact per edge, on_ground has to follow all of them whatever order Box2D
+# begins and ends them in
+@pytest.mark.parametrize("seed", range(3))
+def test_on_ground_follows_contacts(seed):
+    env = hill_racing.HillRacingEnv()
+    env.reset(seed=seed)
+    rng = np.random.default_rng(seed)
+    for action in rng.choice(3, size=600, p=[0.2, 0.6, 0.2]):
+        _, _, terminated, truncated, _ = env.step(int(action))
+        for wheel in env.agent.car.wheels:
+            assert wheel.on_ground == touches_ground(wheel)
+        if terminated or truncated:
+            break
+    env.close()